@@ -1,38 +1,234 @@
-import time
 import asyncio
-from typing import Any, Dict, Optional
+import heapq
+import random
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+
+# Must be a power of two so shard selection is a bitmask instead of a modulo.
+NUM_SHARDS = 32
+_SHARD_MASK = NUM_SHARDS - 1
+SWEEP_INTERVAL_SECONDS = 1.0
+_NS_PER_SECOND = 1_000_000_000
+
+T = TypeVar("T")
 
 
 class TTLCache:
-    def __init__(self):
-        # key -> (value_str, expires_at)
-        self._store: Dict[str, tuple[Any, float]] = {}
-        self._lock = asyncio.Lock()
+    """Process-local TTL cache.
+
+    Every operation is a plain in-memory dict access with no awaits in between,
+    so within a single event loop it cannot interleave with another coroutine and
+    needs no lock. The async wrappers are kept for existing callers; hot paths can
+    use the sync variants directly. Pass ``threaded=True`` when the cache is shared
+    with worker threads so multi-step mutations run under a ``threading.Lock``.
+
+    Entries are spread across ``NUM_SHARDS`` dicts so each one stays small,
+    keeping rehash pauses and prefix scans short. Values and expirations live in
+    parallel dicts (no per-entry tuple), and expirations are integer
+    ``time.monotonic_ns()`` deadlines so wall-clock steps cannot skew TTLs.
+
+    Keys are also indexed by their namespace (the text before the first ``:``),
+    so ``delete_prefix`` only inspects keys from the matching namespace instead
+    of scanning the whole cache.
+
+    Expired entries that are never read again are reclaimed by a background
+    sweeper driven by a min-heap of expirations, so memory stays bounded under
+    write-heavy workloads.
+    """
+
+    def __init__(self, threaded: bool = False):
+        self._guard = threading.Lock() if threaded else nullcontext()
+        # Sharded by hash(key): key -> value and key -> expires_at_ns
+        self._values: List[Dict[str, Any]] = [{} for _ in range(NUM_SHARDS)]
+        self._expiries: List[Dict[str, int]] = [{} for _ in range(NUM_SHARDS)]
+        # namespace -> keys currently stored under it
+        self._namespaces: Dict[str, Set[str]] = {}
+        # (expires_at_ns, key); may hold stale entries for keys that were re-set
+        self._expiry_heap: List[tuple[int, str]] = []
+        self._sweeper_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _namespace(key: str) -> str:
+        return key.split(":", 1)[0]
+
+    def _remove(self, idx: int, key: str) -> None:
+        self._expiries[idx].pop(key, None)
+        self._values[idx].pop(key, None)
+        ns = self._namespace(key)
+        keys = self._namespaces.get(ns)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._namespaces.pop(ns, None)
+
+    def get_sync(self, key: str) -> Optional[Any]:
+        idx = hash(key) & _SHARD_MASK
+        expiries = self._expiries[idx]
+        exp = expiries.get(key)
+        if exp is None:
+            return None
+        if exp < time.monotonic_ns():
+            # expired
+            with self._guard:
+                self._remove(idx, key)
+            return None
+        return self._values[idx].get(key)
+
+    def set_sync(self, key: str, value: Any, ttl_seconds: int) -> None:
+        idx = hash(key) & _SHARD_MASK
+        exp = time.monotonic_ns() + max(0, int(ttl_seconds)) * _NS_PER_SECOND
+        with self._guard:
+            self._values[idx][key] = value
+            self._expiries[idx][key] = exp
+            self._namespaces.setdefault(self._namespace(key), set()).add(key)
+            heapq.heappush(self._expiry_heap, (exp, key))
+        self._ensure_sweeper()
+
+    def delete_sync(self, *keys: str) -> int:
+        """Remove exactly ``keys`` (no prefix matching); returns how many existed."""
+        removed = 0
+        with self._guard:
+            for key in keys:
+                idx = hash(key) & _SHARD_MASK
+                if key in self._expiries[idx]:
+                    self._remove(idx, key)
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._guard:
+            for shard in self._values:
+                shard.clear()
+            for shard in self._expiries:
+                shard.clear()
+            self._namespaces.clear()
+            self._expiry_heap.clear()
+
+    def exists(self, key: str) -> bool:
+        return self.get_sync(key) is not None
+
+    def delete_prefix_sync(self, prefix: str) -> int:
+        with self._guard:
+            return self._delete_prefix(prefix)
+
+    def _delete_prefix(self, prefix: str) -> int:
+        if ":" in prefix:
+            candidates = list(self._namespaces.get(self._namespace(prefix), ()))
+        else:
+            # The prefix may span several namespaces (e.g. "" or "group")
+            candidates = [
+                k
+                for ns, keys in list(self._namespaces.items())
+                if ns.startswith(prefix)
+                for k in list(keys)
+            ]
+        keys = [k for k in candidates if k.startswith(prefix)]
+        for k in keys:
+            self._remove(hash(k) & _SHARD_MASK, k)
+        return len(keys)
+
+    def sweep_expired(self) -> int:
+        """Remove every entry whose expiry has passed. Runs in O(expired)."""
+        with self._guard:
+            return self._sweep_expired()
+
+    def _sweep_expired(self) -> int:
+        now = time.monotonic_ns()
+        heap = self._expiry_heap
+        removed = 0
+        while heap and heap[0][0] <= now:
+            exp, key = heapq.heappop(heap)
+            idx = hash(key) & _SHARD_MASK
+            expiries = self._expiries[idx]
+            # Only drop the entry if it was not refreshed after this heap record
+            if expiries.get(key) == exp:
+                self._remove(idx, key)
+                removed += 1
+        return removed
+
+    def _ensure_sweeper(self) -> None:
+        task = self._sweeper_task
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._sweeper_task = loop.create_task(self._sweeper())
+
+    async def _sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+            try:
+                self.sweep_expired()
+            except Exception:
+                # Best-effort only
+                pass
+
+    async def stop(self) -> None:
+        """Cancel the background sweeper; the next ``set`` starts a new one."""
+        task, self._sweeper_task = self._sweeper_task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        if task.get_loop() is not asyncio.get_running_loop():
+            # Created on a loop that is no longer ours; it cannot be awaited here
+            return
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
     async def get(self, key: str) -> Optional[Any]:
-        now = time.time()
-        async with self._lock:
-            item = self._store.get(key)
-            if not item:
-                return None
-            value, exp = item
-            if exp and exp < now:
-                # expired
-                self._store.pop(key, None)
-                return None
-            return value
+        return self.get_sync(key)
 
     async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
-        exp = time.time() + max(0, int(ttl_seconds))
-        async with self._lock:
-            self._store[key] = (value, exp)
+        self.set_sync(key, value, ttl_seconds)
+
+    async def delete(self, *keys: str) -> int:
+        return self.delete_sync(*keys)
 
     async def delete_prefix(self, prefix: str) -> int:
-        async with self._lock:
-            keys = [k for k in self._store.keys() if k.startswith(prefix)]
-            for k in keys:
-                self._store.pop(k, None)
-            return len(keys)
+        return self.delete_prefix_sync(prefix)
 
 
 cache = TTLCache()
+
+
+def jittered_ttl(base_seconds: int, spread: float = 0.25) -> int:
+    """Return ``base_seconds`` randomly shifted by up to ``spread`` either way.
+
+    Keys written in the same burst would otherwise all expire in the same
+    second and be reloaded together.
+    """
+    delta = int(base_seconds * spread)
+    return max(1, base_seconds + random.randint(-delta, delta))
+
+
+_inflight: Dict[str, "asyncio.Task[Any]"] = {}
+
+
+def _forget_inflight(key: str, task: "asyncio.Task[Any]") -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        # Retrieve the exception so it is not reported when every caller went away
+        task.exception()
+
+
+async def single_flight(key: str, loader: Callable[[], Awaitable[T]]) -> T:
+    """Run ``loader`` once for all concurrent callers asking for ``key``.
+
+    Used around cache-miss fetches so an expired hot key triggers a single
+    database read instead of one per waiting request. The load runs as its
+    own task, so a caller that is cancelled does not cancel it for the others.
+    """
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(loader())  # type: ignore[arg-type]
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _forget_inflight(key, t))
+    return await asyncio.shield(task)
@@ -1,31 +1,68 @@
 from typing import Any, Dict
 
 from .cache import cache as local_cache
+from .config import get_settings
+
+_PREFIX = (get_settings().redis_pubsub_prefix or "").strip()
+# Exact channel names the cache topic may arrive on (see redis_bus._channel)
+_CACHE_TOPICS = frozenset({"cache", f"{_PREFIX}.cache"} if _PREFIX else {"cache"})
 
 async def handle_cache_event(topic: str, event: Dict[str, Any]) -> None:
     """Consume cache bus events and apply local invalidations.
-    Expected events on topic 'cache' with shape: { type: 'invalidate', pattern: '<prefix>' }
+    Expected events on topic 'cache' with shape: { type: 'invalidate', pattern: '<prefix>' },
+    optionally carrying every prefix of a burst in 'patterns', or exact keys in 'keys'.
+    """
+    if topic not in _CACHE_TOPICS:
+        return
+    et = event.get("type")
+    if not isinstance(et, str) or (et != "invalidate" and et.lower() != "invalidate"):
+        return
+    keys = event.get("keys")
+    if isinstance(keys, list):
+        try:
+            local_cache.delete_sync(*(k for k in keys if isinstance(k, str) and k))
+        except Exception:
+            # Best-effort only
+            pass
+        return
+    pats = event.get("patterns")
+    if not isinstance(pats, list):
+        pats = [event.get("pattern")]
+    for pat in pats:
+        if isinstance(pat, str) and pat:
+            try:
+                local_cache.delete_prefix_sync(pat)
+            except Exception:
+                # Best-effort only
+                pass
+
+async def publish_invalidate(pattern: str, *more: str) -> None:
+    """Publish an invalidation event to the cache topic. Safe no-op if Redis pub/sub disabled.
+    Several prefixes can be passed to invalidate them with a single PUBLISH.
     """
     try:
-        if not topic.endswith("cache"):
-            return
-        et = str(event.get("type") or "").lower()
-        if et == "invalidate":
-            pat = str(event.get("pattern") or "")
-            if pat:
-                await local_cache.delete_prefix(pat)
+        from .redis_bus import publish as redis_publish  # lazy import to avoid cycles
+    except Exception:
+        return
+    try:
+        event: Dict[str, Any] = {"type": "invalidate", "pattern": pattern}
+        if more:
+            event["patterns"] = [pattern, *more]
+        await redis_publish("cache", event)
     except Exception:
-        # Best-effort only
+        # Non-fatal
         pass
 
-async def publish_invalidate(pattern: str) -> None:
-    """Publish an invalidation event to the cache topic. Safe no-op if Redis pub/sub disabled."""
+async def publish_invalidate_keys(key: str, *more: str) -> None:
+    """Publish an exact-key invalidation (no prefix matching) to the cache topic.
+    Safe no-op if Redis pub/sub disabled.
+    """
     try:
         from .redis_bus import publish as redis_publish  # lazy import to avoid cycles
     except Exception:
         return
     try:
-        await redis_publish("cache", {"type": "invalidate", "pattern": pattern})
+        await redis_publish("cache", {"type": "invalidate", "keys": [key, *more]})
     except Exception:
         # Non-fatal
         pass
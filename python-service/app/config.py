@@ -1,82 +1,104 @@
 import os
-from functools import lru_cache
-from pydantic import BaseModel, Field
+from dataclasses import dataclass
+from functools import cache
 from pathlib import Path as _Path
+from typing import Mapping
 
-# Fallback: attempt to load .env early if not already loaded
-try:
-    from dotenv import load_dotenv as _load_dotenv  # type: ignore
-    _load_dotenv(dotenv_path=_Path(__file__).resolve().parent.parent / ".env", override=False)
-except Exception:
-    pass
+# Fallback: attempt to load .env early if not already loaded.
+# Set TM_LOAD_DOTENV=0 in deployed images to skip the dotenv import and file lookup.
+if os.getenv("TM_LOAD_DOTENV", "1") == "1":
+    try:
+        from dotenv import load_dotenv as _load_dotenv  # type: ignore
+        _load_dotenv(dotenv_path=_Path(__file__).resolve().parent.parent / ".env", override=False)
+    except Exception:
+        pass
 
-def _redis_pubsub_enabled_default() -> bool:
-    explicit = os.getenv("REDIS_PUBSUB_ENABLED")
+_TRUTHY = frozenset({"1", "true", "yes"})
+
+
+def _flag(env: Mapping[str, str], key: str, default: str = "false") -> bool:
+    return env.get(key, default).lower() in _TRUTHY
+
+
+def _redis_pubsub_enabled_default(env: Mapping[str, str]) -> bool:
+    explicit = env.get("REDIS_PUBSUB_ENABLED")
     if explicit is not None:
-        return explicit.lower() in ("1", "true", "yes")
-    legacy = os.getenv("KAFKA_ENABLED")
+        return explicit.lower() in _TRUTHY
+    legacy = env.get("KAFKA_ENABLED")
     if legacy is not None:
-        return legacy.lower() in ("1", "true", "yes")
-    return bool(os.getenv("REDIS_URL"))
+        return legacy.lower() in _TRUTHY
+    return bool(env.get("REDIS_URL"))
 
 
-class Settings(BaseModel):
-    """Strongly typed settings loaded from environment variables."""
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Strongly typed settings loaded from environment variables.
 
-    # Support multiple common env var names for Mongo connection string
-    mongo_uri: str = Field(
-        default_factory=lambda: (
-            os.getenv("MONGO_URI")
-            or os.getenv("MONGODB_URI")
-            or os.getenv("MONGO_URL")
-            or ""
-        )
-    )
-    mongo_db: str = Field(
-        default_factory=lambda: os.getenv("MONGO_DB_NAME", "jesseiniya2023")
-    )
-    mongo_user_db: str = Field(
-        default_factory=lambda: (
-            os.getenv("MONGO_USER_DB")
-            or os.getenv("MONGO_DB_NAME", "jesseiniya2023")
-        )
-    )
-    mongo_dating_db: str = Field(
-        default_factory=lambda: (
-            os.getenv("MONGO_DATING_DB")
-            or os.getenv("MONGO_DB_NAME", "jesseiniya2023")
-        )
-    )
+    A plain frozen dataclass keeps pydantic-core schema building off the
+    startup path. Use ``Settings.from_env`` to resolve every field from a
+    single environment snapshot.
+    """
+
+    mongo_uri: str
+    mongo_db: str
+    mongo_user_db: str
+    mongo_dating_db: str
     # Optional: provide a non-SRV fallback URI (e.g., mongodb://127.0.0.1:27017)
-    mongo_alt_uri: str = Field(default_factory=lambda: os.getenv("MONGO_ALT_URI", ""))
+    mongo_alt_uri: str
     # Optional: force direct connection (applies to non-SRV URIs)
-    mongo_direct: bool = Field(
-        default_factory=lambda: os.getenv("MONGO_DIRECT", "false").lower()
-        in ("1", "true", "yes")
-    )
-    cors_origin: str = Field(default_factory=lambda: os.getenv("CORS_ORIGIN", "http://localhost:5173"))
-    port: int = Field(default_factory=lambda: int(os.getenv("PY_BACKEND_PORT", "8081")))
+    mongo_direct: bool
+    cors_origin: str
+    port: int
     # Web Push (VAPID)
-    vapid_public_key: str = Field(default_factory=lambda: os.getenv("VAPID_PUBLIC_KEY", ""))
-    vapid_private_key: str = Field(default_factory=lambda: os.getenv("VAPID_PRIVATE_KEY", ""))
-    vapid_subject: str = Field(default_factory=lambda: os.getenv("VAPID_SUBJECT", "mailto:admin@example.com"))
+    vapid_public_key: str
+    vapid_private_key: str
+    vapid_subject: str
 
     # Redis (caching + pub/sub)
-    redis_url: str = Field(default_factory=lambda: os.getenv("REDIS_URL", ""))
-    redis_pubsub_enabled: bool = Field(default_factory=_redis_pubsub_enabled_default)
-    redis_pubsub_prefix: str = Field(default_factory=lambda: os.getenv("REDIS_PUBSUB_PREFIX", os.getenv("KAFKA_TOPIC_PREFIX", "tm")))
+    redis_url: str
+    redis_pubsub_enabled: bool
+    redis_pubsub_prefix: str
 
     # Atlas Search
-    atlas_search_enabled: bool = Field(default_factory=lambda: os.getenv("ATLAS_SEARCH_ENABLED", "false").lower() in ("1", "true", "yes"))
-    atlas_search_index: str = Field(default_factory=lambda: os.getenv("ATLAS_SEARCH_INDEX", "default"))
-    atlas_autocomplete_enabled: bool = Field(default_factory=lambda: os.getenv("ATLAS_AUTOCOMPLETE_ENABLED", "false").lower() in ("1", "true", "yes"))
+    atlas_search_enabled: bool
+    atlas_search_index: str
+    atlas_autocomplete_enabled: bool
 
     # Auth / security
-    jwt_secret: str = Field(default_factory=lambda: os.getenv("JWT_SECRET", "dev-secret-change-me"))
-    auth_token_ttl: int = Field(default_factory=lambda: int(os.getenv("AUTH_TOKEN_TTL", "86400")))
-    auth_rate_limit_window: int = Field(default_factory=lambda: int(os.getenv("AUTH_RATE_LIMIT_WINDOW", "60")))
-    auth_rate_limit_max: int = Field(default_factory=lambda: int(os.getenv("AUTH_RATE_LIMIT_MAX", "20")))
+    jwt_secret: str
+    auth_token_ttl: int
+    auth_rate_limit_window: int
+    auth_rate_limit_max: int
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> "Settings":
+        db_name = env.get("MONGO_DB_NAME", "jesseiniya2023")
+        return cls(
+            # Support multiple common env var names for Mongo connection string
+            mongo_uri=env.get("MONGO_URI") or env.get("MONGODB_URI") or env.get("MONGO_URL") or "",
+            mongo_db=db_name,
+            mongo_user_db=env.get("MONGO_USER_DB") or db_name,
+            mongo_dating_db=env.get("MONGO_DATING_DB") or db_name,
+            mongo_alt_uri=env.get("MONGO_ALT_URI", ""),
+            mongo_direct=_flag(env, "MONGO_DIRECT"),
+            cors_origin=env.get("CORS_ORIGIN", "http://localhost:5173"),
+            port=int(env.get("PY_BACKEND_PORT", "8081")),
+            vapid_public_key=env.get("VAPID_PUBLIC_KEY", ""),
+            vapid_private_key=env.get("VAPID_PRIVATE_KEY", ""),
+            vapid_subject=env.get("VAPID_SUBJECT", "mailto:admin@example.com"),
+            redis_url=env.get("REDIS_URL", ""),
+            redis_pubsub_enabled=_redis_pubsub_enabled_default(env),
+            redis_pubsub_prefix=env.get("REDIS_PUBSUB_PREFIX", env.get("KAFKA_TOPIC_PREFIX", "tm")),
+            atlas_search_enabled=_flag(env, "ATLAS_SEARCH_ENABLED"),
+            atlas_search_index=env.get("ATLAS_SEARCH_INDEX", "default"),
+            atlas_autocomplete_enabled=_flag(env, "ATLAS_AUTOCOMPLETE_ENABLED"),
+            jwt_secret=env.get("JWT_SECRET", "dev-secret-change-me"),
+            auth_token_ttl=int(env.get("AUTH_TOKEN_TTL", "86400")),
+            auth_rate_limit_window=int(env.get("AUTH_RATE_LIMIT_WINDOW", "60")),
+            auth_rate_limit_max=int(env.get("AUTH_RATE_LIMIT_MAX", "20")),
+        )
+
 
-@lru_cache()
+@cache
 def get_settings() -> Settings:
-    return Settings()
\ No newline at end of file
+    return Settings.from_env(dict(os.environ))
@@ -1,8 +1,10 @@
+import asyncio
 import logging
 import os
 from typing import Optional 
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase 
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase 
+from pymongo import ASCENDING, IndexModel, ReplaceOne
 
 from ..config import get_settings
 from .collections import (
@@ -12,6 +14,8 @@ from .collections import (
 )
 from .mongo import ensure_likes_indexes
 
+LOGGER = logging.getLogger("uvicorn.error")
+
 _client: Optional[AsyncIOMotorClient] = None
 _core_db: Optional[AsyncIOMotorDatabase] = None
 _user_db: Optional[AsyncIOMotorDatabase] = None
@@ -19,31 +23,83 @@ _dating_db: Optional[AsyncIOMotorDatabase] = None
 
 
 async def _ensure_user_indexes(db: AsyncIOMotorDatabase) -> None:
-    logger = logging.getLogger("uvicorn.error")
     try:
-        await db[USER_PROFILES_COLLECTION].create_index("usernameLower", unique=True)
-        await db[USER_PROFILES_COLLECTION].create_index("userId", unique=True)
-        await db[USER_PROFILES_COLLECTION].create_index("createdAt")
+        await db[USER_PROFILES_COLLECTION].create_indexes(
+            [
+                IndexModel([("usernameLower", ASCENDING)], unique=True),
+                IndexModel([("userId", ASCENDING)], unique=True),
+                IndexModel([("createdAt", ASCENDING)]),
+            ]
+        )
     except Exception as exc:  # pragma: no cover - best-effort logging
-        logger.error("Failed to ensure user profile indexes: %s", exc)
+        LOGGER.error("Failed to ensure user profile indexes: %s", exc)
 
 
 async def _ensure_dating_indexes(db: AsyncIOMotorDatabase) -> None:
-    logger = logging.getLogger("uvicorn.error")
     try:
-        await db[DATING_PROFILES_COLLECTION].create_index(
-            "userProfileId",
-            unique=True,
-            sparse=True,
-        )
-        await db[DATING_PROFILES_COLLECTION].create_index(
-            "userId",
-            unique=True,
-            sparse=True,
+        await db[DATING_PROFILES_COLLECTION].create_indexes(
+            [
+                IndexModel([("userProfileId", ASCENDING)], unique=True, sparse=True),
+                IndexModel([("userId", ASCENDING)], unique=True, sparse=True),
+                IndexModel([("updatedAt", ASCENDING)]),
+            ]
         )
-        await db[DATING_PROFILES_COLLECTION].create_index("updatedAt")
     except Exception as exc:  # pragma: no cover - best-effort logging
-        logger.error("Failed to ensure dating profile indexes: %s", exc)
+        LOGGER.error("Failed to ensure dating profile indexes: %s", exc)
+
+
+_MIGRATE_MATCH = {"_id": {"$exists": True}, "userProfileId": {"$exists": True}}
+_MIGRATE_BULK_SIZE = 1000
+
+
+async def _merge_legacy_collection(
+    legacy_collection: AsyncIOMotorCollection,
+    target_collection: AsyncIOMotorCollection,
+) -> int:
+    """Upsert every migratable legacy document into the target collection by ``_id``.
+
+    Prefers a server-side ``$merge`` so documents never leave the cluster, falling back to
+    batched ``ReplaceOne`` upserts when the server rejects it (e.g. pre-4.4 cross-db merge).
+    """
+
+    migrated = await legacy_collection.count_documents(_MIGRATE_MATCH)
+    if not migrated:
+        return 0
+
+    try:
+        await legacy_collection.aggregate(
+            [
+                {"$match": _MIGRATE_MATCH},
+                {
+                    "$merge": {
+                        "into": {
+                            "db": target_collection.database.name,
+                            "coll": target_collection.name,
+                        },
+                        "on": "_id",
+                        "whenMatched": "replace",
+                        "whenNotMatched": "insert",
+                    }
+                },
+            ]
+        ).to_list(length=None)
+        return migrated
+    except Exception as exc:
+        LOGGER.info(
+            "$merge unavailable for '%s', falling back to bulk upserts: %s",
+            legacy_collection.name,
+            exc,
+        )
+
+    ops: list[ReplaceOne] = []
+    async for document in legacy_collection.find(_MIGRATE_MATCH, batch_size=_MIGRATE_BULK_SIZE):
+        ops.append(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+        if len(ops) >= _MIGRATE_BULK_SIZE:
+            await target_collection.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await target_collection.bulk_write(ops, ordered=False)
+    return migrated
 
 
 async def _migrate_legacy_dating_profiles(
@@ -55,12 +111,11 @@ async def _migrate_legacy_dating_profiles(
 
     target_name = DATING_PROFILES_COLLECTION
     legacy_names = LEGACY_DATING_PROFILES_COLLECTIONS
-    logger = logging.getLogger("uvicorn.error")
 
     try:
         source_collections = await source_db.list_collection_names()
     except Exception as exc:  # pragma: no cover - defensive logging
-        logger.error("Failed to list collections for migration: %s", exc)
+        LOGGER.error("Failed to list collections for migration: %s", exc)
         return
 
     legacy_candidates = [
@@ -74,19 +129,10 @@ async def _migrate_legacy_dating_profiles(
 
     for legacy_name in legacy_candidates:
         legacy_collection = source_db[legacy_name]
-        migrated = 0
         try:
-            async for document in legacy_collection.find({}):
-                if "_id" not in document or "userProfileId" not in document:
-                    continue
-                await target_collection.replace_one(
-                    {"_id": document["_id"]},
-                    document,
-                    upsert=True,
-                )
-                migrated += 1
+            migrated = await _merge_legacy_collection(legacy_collection, target_collection)
         except Exception as exc:  # pragma: no cover - best-effort logging
-            logger.error(
+            LOGGER.error(
                 "Failed migrating legacy dating profiles from '%s': %s",
                 legacy_name,
                 exc,
@@ -95,14 +141,14 @@ async def _migrate_legacy_dating_profiles(
 
         try:
             await legacy_collection.drop()
-            logger.info(
+            LOGGER.info(
                 "Migrated %s legacy dating profiles from '%s' into '%s' and dropped legacy collection",
                 migrated,
                 legacy_name,
                 target_name,
             )
         except Exception as exc:  # pragma: no cover - best-effort logging
-            logger.error(
+            LOGGER.error(
                 "Failed to drop legacy dating profiles collection '%s': %s",
                 legacy_name,
                 exc,
@@ -110,11 +156,102 @@ async def _migrate_legacy_dating_profiles(
 
 
 async def _ensure_core_indexes(db: AsyncIOMotorDatabase) -> None:
-    logger = logging.getLogger("uvicorn.error")
     try:
         await ensure_likes_indexes(db)
     except Exception as exc:  # pragma: no cover - best-effort logging
-        logger.error("Failed to ensure likes indexes: %s", exc)
+        LOGGER.error("Failed to ensure likes indexes: %s", exc)
+
+
+_SANITIZE_LEGACY_FIELDS = (
+    "username",
+    "usernameLower",
+    "displayName",
+    "name",
+    "photo",
+    "photoUrl",
+    "hasDatingProfile",
+)
+
+# Profiles that still need a firstName or primaryPhotoUrl backfilled.
+_SANITIZE_REPAIR_QUERY = {
+    "$or": [
+        {"firstName": {"$exists": False}},
+        {"firstName": None},
+        {"firstName": ""},
+        {"primaryPhotoUrl": {"$exists": False}},
+    ]
+}
+
+# Profiles still carrying legacy fields, or needing repair without a usable userId,
+# are deleted outright.
+_SANITIZE_DELETE_QUERY = {
+    "$or": [
+        *[{field: {"$exists": True}} for field in _SANITIZE_LEGACY_FIELDS],
+        {
+            "$and": [
+                _SANITIZE_REPAIR_QUERY,
+                {
+                    "$or": [
+                        {"userId": {"$not": {"$type": "string"}}},
+                        {"userId": {"$regex": r"^\s*$"}},
+                    ]
+                },
+            ]
+        },
+    ]
+}
+
+
+def _trimmed_string_expr(path: str) -> dict:
+    """Aggregation expression yielding the trimmed value at ``path`` or '' if it is not a string."""
+
+    return {"$cond": [{"$eq": [{"$type": path}, "string"]}, {"$trim": {"input": path}}, ""]}
+
+
+# Legacy name/photo fallbacks only exist on documents removed by the delete pass, so the
+# server-side repair just promotes the first non-empty ``photos`` entry when
+# ``primaryPhotoUrl`` is unusable. Documents without a candidate are left untouched.
+_SANITIZE_REPAIR_PIPELINE = [
+    {
+        "$set": {
+            "primaryPhotoUrl": {
+                "$cond": [
+                    {"$ne": [_trimmed_string_expr("$primaryPhotoUrl"), ""]},
+                    "$primaryPhotoUrl",
+                    {
+                        "$ifNull": [
+                            {
+                                "$arrayElemAt": [
+                                    {
+                                        "$filter": {
+                                            "input": {
+                                                "$map": {
+                                                    "input": {
+                                                        "$cond": [{"$isArray": "$photos"}, "$photos", []]
+                                                    },
+                                                    "as": "p",
+                                                    "in": _trimmed_string_expr("$$p"),
+                                                }
+                                            },
+                                            "as": "p",
+                                            "cond": {"$ne": ["$$p", ""]},
+                                        }
+                                    },
+                                    0,
+                                ]
+                            },
+                            "$primaryPhotoUrl",
+                        ]
+                    },
+                ]
+            }
+        }
+    },
+]
+
+
+def _clean_user_ids(values: list) -> set[str]:
+    return {v.strip() for v in values if isinstance(v, str) and v.strip()}
 
 
 async def _sanitize_dating_profiles(
@@ -124,111 +261,26 @@ async def _sanitize_dating_profiles(
     if dating_db is None or user_db is None:
         return
 
-    logger = logging.getLogger("uvicorn.error")
     collection = dating_db[DATING_PROFILES_COLLECTION]
-    legacy_fields = ("username", "usernameLower", "displayName", "name", "photo", "photoUrl", "hasDatingProfile")
-    query = {
-        "$or": [
-            {"firstName": {"$exists": False}},
-            {"firstName": None},
-            {"firstName": ""},
-            {"primaryPhotoUrl": {"$exists": False}},
-            *[{field: {"$exists": True}} for field in legacy_fields],
-        ]
-    }
-
-    projection = {
-        "_id": 1,
-        "userId": 1,
-        "userProfileId": 1,
-        "firstName": 1,
-        "displayName": 1,
-        "name": 1,
-        "username": 1,
-        "photo": 1,
-        "photoUrl": 1,
-        "primaryPhotoUrl": 1,
-        "photos": 1,
-        "hasDatingProfile": 1,
-    }
 
     try:
-        cursor = collection.find(query, projection=projection)
-    except Exception as exc:  # pragma: no cover - defensive logging
-        logger.error("Failed to query dating profiles for sanitization: %s", exc)
+        users_without_profiles = _clean_user_ids(
+            await collection.distinct("userId", _SANITIZE_DELETE_QUERY)
+        )
+        await collection.delete_many(_SANITIZE_DELETE_QUERY)
+    except Exception as exc:  # pragma: no cover - best-effort logging
+        LOGGER.error("Failed to delete legacy dating profiles: %s", exc)
         return
 
-    users_with_profiles: set[str] = set()
-    users_without_profiles: set[str] = set()
-
-    async for document in cursor:
-        set_ops: dict[str, object] = {}
-        unset_ops: dict[str, str] = {}
-
-        raw_user_id = document.get("userId")
-        user_id = raw_user_id.strip() if isinstance(raw_user_id, str) else ""
-        should_delete = not user_id
-
-        if any(field in document for field in legacy_fields):
-            should_delete = True
-
-        if should_delete:
-            try:
-                await collection.delete_one({"_id": document["_id"]})
-                if user_id:
-                    users_without_profiles.add(user_id)
-            except Exception as exc:  # pragma: no cover - best-effort logging
-                logger.error("Failed to delete legacy dating profile %s: %s", document.get("_id"), exc)
-            continue
-
-        first_name = document.get("firstName")
-        if not isinstance(first_name, str) or not first_name.strip():
-            for candidate_key in ("displayName", "name", "username"):
-                candidate_val = document.get(candidate_key)
-                if isinstance(candidate_val, str) and candidate_val.strip():
-                    first_name = candidate_val.strip()
-                    break
-            else:
-                first_name = None
-        if first_name:
-            set_ops["firstName"] = first_name
-
-        primary_photo = document.get("primaryPhotoUrl")
-        if not isinstance(primary_photo, str) or not primary_photo.strip():
-            for photo_key in ("photo", "photoUrl"):
-                candidate_photo = document.get(photo_key)
-                if isinstance(candidate_photo, str) and candidate_photo.strip():
-                    primary_photo = candidate_photo.strip()
-                    break
-            else:
-                primary_photo = None
-            if not primary_photo:
-                photos = document.get("photos")
-                if isinstance(photos, list):
-                    primary_photo = next(
-                        (p.strip() for p in photos if isinstance(p, str) and p.strip()),
-                        None,
-                    )
-        if primary_photo:
-            set_ops["primaryPhotoUrl"] = primary_photo
-
-        for field in legacy_fields:
-            if field in document:
-                unset_ops[field] = ""
-
-        update_doc: dict[str, object] = {}
-        if set_ops:
-            update_doc["$set"] = set_ops
-        if unset_ops:
-            update_doc["$unset"] = unset_ops
-
-        if update_doc:
-            try:
-                await collection.update_one({"_id": document["_id"]}, update_doc)
-            except Exception as exc:  # pragma: no cover - best-effort logging
-                logger.error("Failed to sanitize dating profile %s: %s", document.get("_id"), exc)
-
-        users_with_profiles.add(user_id)
+    try:
+        users_with_profiles = _clean_user_ids(
+            await collection.distinct("userId", _SANITIZE_REPAIR_QUERY)
+        )
+        if users_with_profiles:
+            await collection.update_many(_SANITIZE_REPAIR_QUERY, _SANITIZE_REPAIR_PIPELINE)
+    except Exception as exc:  # pragma: no cover - best-effort logging
+        LOGGER.error("Failed to sanitize dating profiles: %s", exc)
+        users_with_profiles = set()
 
     if users_with_profiles or users_without_profiles:
         user_collection = user_db[USER_PROFILES_COLLECTION]
@@ -245,7 +297,7 @@ async def _sanitize_dating_profiles(
                     {"$unset": {"hasDatingProfile": ""}},
                 )
         except Exception as exc:  # pragma: no cover - best-effort logging
-            logger.error("Failed to synchronize hasDatingProfile flag: %s", exc)
+            LOGGER.error("Failed to synchronize hasDatingProfile flag: %s", exc)
 
 
 async def connect_to_mongo() -> None:
@@ -257,76 +309,103 @@ async def connect_to_mongo() -> None:
     if not settings.mongo_uri and not getattr(settings, "mongo_alt_uri", None):
         raise RuntimeError("Missing MONGO_URI env var for python-service")
 
-    logger = logging.getLogger("uvicorn.error")
     sel_timeout_ms = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "3000"))
     conn_timeout_ms = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "3000"))
     sock_timeout_ms = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "5000"))
-
-    async def _try_connect(uri: str) -> tuple[
-        AsyncIOMotorClient,
-        AsyncIOMotorDatabase,
-        AsyncIOMotorDatabase,
-        AsyncIOMotorDatabase,
-    ]:
-        client = AsyncIOMotorClient(
+    max_pool_size = int(os.getenv("MONGO_MAX_POOL", "100"))
+    min_pool_size = int(os.getenv("MONGO_MIN_POOL", "5"))
+    max_idle_ms = int(os.getenv("MONGO_MAX_IDLE_MS", "60000"))
+    # zlib ships with CPython; zstd/snappy need optional packages, so opt in via env.
+    compressors = os.getenv("MONGO_COMPRESSORS", "zlib")
+
+    def _open_client(uri: str) -> AsyncIOMotorClient:
+        return AsyncIOMotorClient(
             uri,
-            maxPoolSize=20,
+            maxPoolSize=max_pool_size,
+            minPoolSize=min_pool_size,
+            maxIdleTimeMS=max_idle_ms,
+            compressors=compressors,
+            zlibCompressionLevel=3,
             serverSelectionTimeoutMS=sel_timeout_ms,
             connectTimeoutMS=conn_timeout_ms,
             socketTimeoutMS=sock_timeout_ms,
             **({"directConnection": True} if getattr(settings, "mongo_direct", False) else {}),
         )
-        core_db = client[settings.mongo_db]
-        user_db = client[settings.mongo_user_db]
-        dating_db = client[settings.mongo_dating_db]
 
+    async def _ping(label: str, client: AsyncIOMotorClient) -> str:
         await client.admin.command("ping")
-        await _ensure_core_indexes(core_db)
-        await _ensure_user_indexes(user_db)
-        await _migrate_legacy_dating_profiles(core_db, dating_db)
-        await _ensure_dating_indexes(dating_db)
-        await _sanitize_dating_profiles(dating_db, user_db)
-
-        return client, core_db, user_db, dating_db
-
-    primary_error: Optional[Exception] = None
-
-    try:
-        _client, _core_db, _user_db, _dating_db = await _try_connect(settings.mongo_uri)
-        addr = getattr(_client, "address", None)
-        if addr:
-            logger.info(
-                "MongoDB connected: core_db=%s, primary=%s:%s",
-                settings.mongo_db,
-                addr[0],
-                addr[1],
-            )
-        else:
-            logger.info("MongoDB connected: core_db=%s", settings.mongo_db)
-        return
-    except Exception as exc:  # pragma: no cover - connection issues asserted in tests
-        primary_error = exc
-        logger.error("Mongo primary URI failed: %s", exc)
-
-    alt_uri = getattr(settings, "mongo_alt_uri", None)
-    if alt_uri:
+        return label
+
+    # Race the primary and ALT URIs and keep whichever answers a ping first, so a slow
+    # primary no longer delays startup by a full server-selection timeout.
+    candidates = [
+        (label, uri)
+        for label, uri in (("primary", settings.mongo_uri), ("ALT", getattr(settings, "mongo_alt_uri", None)))
+        if uri
+    ]
+    clients: dict[str, AsyncIOMotorClient] = {}
+    tasks: dict[asyncio.Task, str] = {}
+    for label, uri in candidates:
         try:
-            _client, _core_db, _user_db, _dating_db = await _try_connect(alt_uri)
-            addr = getattr(_client, "address", None)
-            if addr:
-                logger.info(
-                    "MongoDB connected via ALT URI: core_db=%s, primary=%s:%s",
-                    settings.mongo_db,
-                    addr[0],
-                    addr[1],
-                )
-            else:
-                logger.info("MongoDB connected via ALT URI: core_db=%s", settings.mongo_db)
-            return
-        except Exception as exc:  # pragma: no cover - same as above
-            logger.error("Mongo ALT URI failed: %s", exc)
+            clients[label] = _open_client(uri)
+        except Exception as exc:  # pragma: no cover - invalid URI
+            LOGGER.error("Mongo %s URI failed: %s", label, exc)
+            continue
+        tasks[asyncio.create_task(_ping(label, clients[label]))] = label
+
+    winner: Optional[str] = None
+    errors: dict[str, Exception] = {}
+    pending = set(tasks)
+    while pending and winner is None:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            label = tasks[task]
+            exc = task.exception()
+            if exc is not None:  # pragma: no cover - connection issues asserted in tests
+                errors[label] = exc
+                LOGGER.error("Mongo %s URI failed: %s", label, exc)
+            elif winner is None:
+                winner = label
+    for task in pending:
+        task.cancel()
+
+    for label, client in clients.items():
+        if label != winner and client is not clients.get(winner or ""):
+            client.close()
+
+    if winner is None:
+        raise errors.get("primary") or next(iter(errors.values()), None) or RuntimeError(
+            "Mongo connection failed"
+        )
 
-    raise primary_error or RuntimeError("Mongo connection failed")
+    client = clients[winner]
+    core_db = client[settings.mongo_db]
+    user_db = client[settings.mongo_user_db]
+    dating_db = client[settings.mongo_dating_db]
+
+    # Core and user indexes target independent databases; overlap their round trips.
+    await asyncio.gather(
+        _ensure_core_indexes(core_db),
+        _ensure_user_indexes(user_db),
+    )
+    # Migration must precede dating indexes, and sanitization must come last.
+    await _migrate_legacy_dating_profiles(core_db, dating_db)
+    await _ensure_dating_indexes(dating_db)
+    await _sanitize_dating_profiles(dating_db, user_db)
+
+    _client, _core_db, _user_db, _dating_db = client, core_db, user_db, dating_db
+    via = "" if winner == "primary" else " via ALT URI"
+    addr = getattr(_client, "address", None)
+    if addr:
+        LOGGER.info(
+            "MongoDB connected%s: core_db=%s, primary=%s:%s",
+            via,
+            settings.mongo_db,
+            addr[0],
+            addr[1],
+        )
+    else:
+        LOGGER.info("MongoDB connected%s: core_db=%s", via, settings.mongo_db)
 
 
 async def close_mongo_connection() -> None:
@@ -337,7 +416,7 @@ async def close_mongo_connection() -> None:
         try:
             _client.close()
         finally:
-            logging.getLogger("uvicorn.error").info("MongoDB connection closed")
+            LOGGER.info("MongoDB connection closed")
         _client = None
 
 
@@ -1,25 +1,38 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from .collections import LIKES_COLLECTION
 
-async def ensure_likes_indexes(db: AsyncIOMotorDatabase) -> None:
-    collection = db[LIKES_COLLECTION]
-    await collection.create_index(
+_LIKES_INDEXES = [
+    IndexModel(
         [("liker_id", ASCENDING), ("liked_id", ASCENDING)],
         name="likes_liker_liked_unique",
         unique=True,
-    )
-    await collection.create_index(
+    ),
+    IndexModel(
         [("liked_id", ASCENDING), ("created_at", DESCENDING)],
         name="likes_liked_id_idx",
-    )
-    await collection.create_index(
+    ),
+    IndexModel(
         [("liker_id", ASCENDING), ("created_at", DESCENDING)],
         name="likes_liker_id_idx",
-    )
+    ),
+]
+_LIKES_INDEX_NAMES = frozenset(index.document["name"] for index in _LIKES_INDEXES)
+
+
+async def ensure_likes_indexes(db: AsyncIOMotorDatabase) -> None:
+    collection = db[LIKES_COLLECTION]
+    # listIndexes is a cheap read; skip the createIndexes command when nothing is missing
+    # index_information is awaitable under both Motor and mongomock-motor
+    existing = set(await collection.index_information())
+    if _LIKES_INDEX_NAMES.issubset(existing):
+        return
+    await collection.create_indexes(_LIKES_INDEXES)
+
 
 def get_likes_collection(db: AsyncIOMotorDatabase):
     return db[LIKES_COLLECTION]
 
+
 __all__ = ["LIKES_COLLECTION", "ensure_likes_indexes", "get_likes_collection"]
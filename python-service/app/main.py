@@ -1,19 +1,15 @@
+import os
 from pathlib import Path as _Path
 # Load .env ASAP to ensure settings see env vars before any imports cache them
-try:
-    from dotenv import load_dotenv as _load_dotenv  # type: ignore
-    _load_dotenv(dotenv_path=_Path(__file__).resolve().parent.parent / ".env", override=True)
-except Exception:
-    pass
+if os.getenv("TM_LOAD_DOTENV", "1") == "1":
+    try:
+        from dotenv import load_dotenv as _load_dotenv  # type: ignore
+        _load_dotenv(dotenv_path=_Path(__file__).resolve().parent.parent / ".env", override=True)
+    except Exception:
+        pass
 
-import os
 from fastapi import FastAPI
-try:
-    from fastapi.responses import ORJSONResponse  # type: ignore
-    _DEFAULT_RESPONSE_CLS = ORJSONResponse
-except Exception:
-    from fastapi.responses import JSONResponse  # type: ignore
-    _DEFAULT_RESPONSE_CLS = JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .config import get_settings
 from .db import (
@@ -40,21 +36,34 @@ from .routers import (
     dating_profiles_api,
 )
 import asyncio
+import time
 
 from .routers.groups import warm_groups_cache
+from .routers.indices import ensure_indexes
+from .integrations.cloudinary import (
+    is_enabled as cld_enabled,
+    ensure_configured as cld_ensure,
+    get_status as cld_status,
+)
 from fastapi.middleware.gzip import GZipMiddleware
-from .redis_bus import start_consumer as redis_bus_start_consumer, stop as redis_bus_stop
+from .redis_bus import (
+    publish_stats as redis_bus_publish_stats,
+    start_consumer as redis_bus_start_consumer,
+    stop as redis_bus_stop,
+)
 from .readmodels import event_stream_handler
+from .cache import cache as local_cache
 
-app = FastAPI(title="Truematch Python API", default_response_class=_DEFAULT_RESPONSE_CLS)
+app = FastAPI(title="Truematch Python API", default_response_class=ORJSONResponse)
 settings = get_settings()
 
 # Build CORS origins list from env (supports CSV). Include both localhost and 127.0.0.1 by default.
 _origins_env = os.getenv("CORS_ORIGINS") or os.getenv("CORS_ORIGIN") or "http://localhost:5173,http://127.0.0.1:5173"
-_allow_origins = [o.strip() for o in _origins_env.split(",") if o.strip()]
+# Starlette checks `origin in allow_origins` on every request; a frozenset makes that O(1)
+_allow_origins = frozenset(o.strip() for o in _origins_env.split(",") if o.strip())
 try:
     # Log configured origins for debugging
-    print(f"[CORS] allow_origins={_allow_origins}") 
+    print(f"[CORS] allow_origins={sorted(_allow_origins)}") 
 except Exception:
     pass
 
@@ -66,30 +75,49 @@ app.add_middleware(
     expose_headers=["ETag"],
     allow_credentials=True,
 )
-app.add_middleware(GZipMiddleware, minimum_size=512)
+# Small JSON payloads are not worth compressing in-process; deployments behind a
+# compressing proxy can set GZIP_ENABLED=false to skip the middleware entirely.
+if os.getenv("GZIP_ENABLED", "true").lower() in ("1", "true", "yes"):
+    app.add_middleware(GZipMiddleware, minimum_size=int(os.getenv("GZIP_MIN_SIZE", "4096")))
 
 # Simple slow-request logger
+try:
+    _SLOW_REQUEST_S = int(os.getenv("SLOW_REQUEST_MS", "800")) / 1000.0
+except ValueError:
+    _SLOW_REQUEST_S = 0.8
+
+
 @app.middleware("http")
 async def log_slow_requests(request, call_next):
-    import time as _t
-    t0 = _t.time()
+    t0 = time.perf_counter()
     response = await call_next(request)
-    dt = (_t.time() - t0) * 1000
+    dt = time.perf_counter() - t0
+    if dt >= _SLOW_REQUEST_S:
+        print(f"[perf] slow request {request.method} {request.url.path} {int(dt * 1000)}ms status={response.status_code}")
+    return response
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _log_cloudinary_status(info: dict) -> None:
     try:
-        slow_ms = int(os.getenv("SLOW_REQUEST_MS", "800"))
-        if dt >= slow_ms:
-            print(f"[perf] slow request {request.method} {request.url.path} {int(dt)}ms status={response.status_code}")
+        from cloudinary import api as cld_api  # type: ignore
+        res = await asyncio.to_thread(cld_api.ping)
+        ping_ok = str(res.get("status", "")).lower() == "ok"
     except Exception:
-        pass
-    return response
+        ping_ok = False
+    print(
+        f"[Cloudinary] configured={bool(info.get('configured'))} cloud={info.get('cloudName') or 'unknown'} via_url={'yes' if info.get('usingUrl') else 'no'} ping={'ok' if ping_ok else 'failed'}"
+    )
+    _background_tasks.discard(asyncio.current_task())
+
 
 @app.on_event("startup")
 async def startup():
     await connect_to_mongo()
     # Ensure essential indexes (idempotent)
     try:
-        from .routers.indices import ensure_indexes  # reuse the same logic
-        await ensure_indexes()  # called programmatically
+        await ensure_indexes()  # reuse the same logic as the admin endpoint
     except Exception as e:
         try:
             print(f"[Mongo] ensure indexes failed (non-fatal): {e}") 
@@ -112,24 +140,10 @@ async def startup():
 
     # Cloudinary status log (non-fatal)
     try:
-        from .integrations.cloudinary import (
-            is_enabled as cld_enabled,
-            ensure_configured as cld_ensure,
-            get_status as cld_status,
-        )
         if cld_enabled():
             cld_ensure()
-            info = cld_status() or {}
-            ping_ok = None
-            try:
-                from cloudinary import api as cld_api  # type: ignore
-                res = cld_api.ping()
-                ping_ok = str(res.get("status", "")).lower() == "ok"
-            except Exception:
-                ping_ok = False
-            print(
-                f"[Cloudinary] configured={bool(info.get('configured'))} cloud={info.get('cloudName') or 'unknown'} via_url={'yes' if info.get('usingUrl') else 'no'} ping={'ok' if ping_ok else 'failed'}"
-            )
+            # The ping is a blocking HTTPS call; run it off the loop so startup isn't held up.
+            _background_tasks.add(asyncio.create_task(_log_cloudinary_status(cld_status() or {})))
         else:
             print("[Cloudinary] not configured")
     except Exception as e:
@@ -142,6 +156,7 @@ async def shutdown():
         await redis_bus_stop()
     except Exception:
         pass
+    await local_cache.stop()
 
 # Routers
 app.include_router(groups.router, prefix="/api", tags=["groups"])
@@ -184,4 +199,8 @@ async def db_health():
         },
     }
 
+@app.get("/api/health/events")
+async def events_health():
+    return {"publisher": redis_bus_publish_stats()}
+
 # Redis health endpoint removed
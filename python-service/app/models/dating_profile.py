@@ -8,7 +8,12 @@ from .identifiers import PyObjectId
 class DatingProfileDocument(BaseModel):
     """Canonical dating profile document stored in MongoDB."""
 
-    model_config = ConfigDict(populate_by_name=True, extra="allow", arbitrary_types_allowed=True)
+    model_config = ConfigDict(
+        populate_by_name=True,
+        extra="allow",
+        arbitrary_types_allowed=True,
+        frozen=True,
+    )
 
     id: PyObjectId = Field(alias="_id")
     user_profile_id: PyObjectId = Field(alias="userProfileId")
@@ -22,21 +27,12 @@ class DatingProfileDocument(BaseModel):
     updated_at: int = Field(alias="updatedAt")
 
 
-class DatingProfile(BaseModel):
-    """Public representation of a dating profile returned via the API."""
-
-    model_config = ConfigDict(populate_by_name=True, extra="allow", arbitrary_types_allowed=True)
+class DatingProfile(DatingProfileDocument):
+    """Public representation of a dating profile returned via the API.
 
-    id: PyObjectId = Field(alias="_id")
-    user_profile_id: PyObjectId = Field(alias="userProfileId")
-    user_id: str = Field(alias="userId")
-    first_name: Optional[str] = Field(default=None, alias="firstName")
-    primary_photo_url: Optional[str] = Field(default=None, alias="primaryPhotoUrl")
-    photos: List[str] = Field(default_factory=list)
-    is_active: bool = Field(default=False, alias="isActive")
-    bio: Optional[str] = None
-    created_at: int = Field(alias="createdAt")
-    updated_at: int = Field(alias="updatedAt")
+    Shares its fields with ``DatingProfileDocument``; the subclass only gives the
+    API schema its own name.
+    """
 
 
 class DatingProfileUpsert(BaseModel):
@@ -10,23 +10,26 @@ from pydantic.functional_validators import BeforeValidator
 
 
 def _validate_object_id(value: Any) -> ObjectId:
-    if isinstance(value, ObjectId):
+    if type(value) is ObjectId:
         return value
     if isinstance(value, str):
-        text = value.strip()
+        # Hex ids coming back from Mongo/clients are already exactly 24 chars
+        text = value if len(value) == 24 else value.strip()
         if not text:
             raise ValueError("ObjectId string must not be empty")
         try:
             return ObjectId(text)
         except Exception as exc:  # pragma: no cover - invalid hex
             raise ValueError("Invalid ObjectId hex string") from exc
+    if isinstance(value, ObjectId):
+        return value
     raise TypeError("ObjectId value must be str or ObjectId instance")
 
 
 PyObjectId = Annotated[
     ObjectId,
     BeforeValidator(_validate_object_id),
-    PlainSerializer(lambda value: str(value), return_type=str),
+    PlainSerializer(ObjectId.__str__, return_type=str),
 ]
 
 __all__ = ["PyObjectId"]
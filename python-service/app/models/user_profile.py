@@ -25,13 +25,15 @@ class UserLoginRequest(BaseModel):
 class UserProfileDocument(BaseModel):
     """Canonical representation of a user profile document stored in MongoDB."""
 
-    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+    # Read-only snapshots: updates go through the repository and return a new instance
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True, frozen=True)
 
     id: PyObjectId = Field(alias="_id")
     user_id: str = Field(alias="userId")
     username: str
     username_lower: str = Field(alias="usernameLower")
-    password_hash: str = Field(alias="passwordHash")
+    # Read paths project the hash out; it is only populated on insert
+    password_hash: Optional[str] = Field(default=None, alias="passwordHash")
     avatar_url: Optional[str] = Field(default=None, alias="avatarUrl")
     friends: List[str] = Field(default_factory=list)
     created_at: int = Field(alias="createdAt")
@@ -41,7 +43,7 @@ class UserProfileDocument(BaseModel):
 class UserProfile(BaseModel):
     """Public-facing user profile returned to clients."""
 
-    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True, frozen=True)
 
     id: PyObjectId = Field(alias="_id")
     user_id: str = Field(alias="userId")
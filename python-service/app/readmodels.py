@@ -1,54 +1,129 @@
 import asyncio
 import time
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo import ReturnDocument
 
 from .db import get_db
-from .cache import cache as local_cache
+from .cache import cache as local_cache, jittered_ttl
 from .cache_bus import handle_cache_event
 from .cache_bus import publish_invalidate
 from .collections import GROUP_MESSAGES_COLLECTION
 
 
 def _sanitize_message(doc: Dict) -> Dict:
-    if not doc:
+    """Return ``doc`` ready for the read model.
+
+    Callers already exclude ``_id`` (query projection / event payload) and
+    writers always set ``reactions``, so a copy is only made for legacy docs.
+    """
+    if not doc or ("_id" not in doc and isinstance(doc.get("reactions"), dict)):
         return doc
     d = dict(doc)
     d.pop("_id", None)
-    if "reactions" not in d or not isinstance(d["reactions"], dict):
+    if not isinstance(d.get("reactions"), dict):
         d["reactions"] = {}
     return d
 
 
-async def _update_latest_messages(group_id: str, message_id: str, window: int = 200) -> None:
-    """Fetch the full message doc and append it to the materialized latest window.
-    Also refresh local caches for common sizes.
+def message_created_event(group_id: str, message_id: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the ``message_created`` event published on the messages topic.
+
+    The full document (minus ``_id``) rides along so ``event_stream_handler``
+    can update the read model without re-reading it.
+    """
+    return {
+        "type": "message_created",
+        "groupId": group_id,
+        "messageId": message_id,
+        "createdAt": doc["createdAt"],
+        "username": doc.get("username"),
+        "userId": doc.get("userId"),
+        "text": doc.get("text"),
+        "message": {k: v for k, v in doc.items() if k != "_id"},
+    }
+
+
+# Per-group write rate (EWMA, messages/second) used to size latest-window TTLs.
+# Hot groups are invalidated on nearly every read anyway; quiet ones can be kept far longer.
+_RATE_DECAY = 0.9
+_MIN_LATEST_TTL = 3
+_MAX_LATEST_TTL = 300
+_MAX_TRACKED_GROUPS = 10_000
+_group_rate: Dict[str, Tuple[float, float]] = {}  # groupId -> (rate, last write monotonic)
+
+
+def _record_group_write(group_id: str) -> None:
+    now = time.monotonic()
+    prev = _group_rate.pop(group_id, None)
+    if prev is None:
+        rate = 0.0
+    else:
+        rate, last = prev
+        rate = _RATE_DECAY * rate + (1 - _RATE_DECAY) / max(now - last, 1e-3)
+    if len(_group_rate) >= _MAX_TRACKED_GROUPS:
+        # Dicts keep insertion order and writes re-insert, so the first key is the least recently written
+        _group_rate.pop(next(iter(_group_rate)))
+    _group_rate[group_id] = (rate, now)
+
+
+def latest_ttl_for(group_id: str, default: int) -> int:
+    """TTL in seconds for cached latest-message windows of ``group_id``.
+
+    Scales inversely with the group's recent write rate; groups with no
+    recorded writes keep ``default``.
+    """
+    entry = _group_rate.get(group_id)
+    if entry is None or entry[0] <= 0:
+        return default
+    rate, last = entry
+    # A group that went quiet decays towards the idle gap instead of its old burst rate
+    rate = min(rate, 1.0 / max(time.monotonic() - last, 1e-3))
+    # Floor the rate where the TTL reaches the cap, so quiet groups can get there
+    ttl = int(20.0 / max(20.0 / _MAX_LATEST_TTL, rate))
+    return min(_MAX_LATEST_TTL, max(_MIN_LATEST_TTL, ttl))
+
+
+async def _update_latest_messages(
+    group_id: str,
+    message_id: str,
+    message: Optional[Dict[str, Any]] = None,
+    window: int = 200,
+) -> None:
+    """Append the message doc to the materialized latest window.
+    Uses the document carried by the event when present; older publishers only
+    send ids, in which case it is fetched. Also refresh local caches for common sizes.
     """
     db = get_db()
-    msg = await db[GROUP_MESSAGES_COLLECTION].find_one({"messageId": message_id})
+    if isinstance(message, dict) and message.get("messageId") == message_id:
+        msg = message
+    else:
+        msg = await db[GROUP_MESSAGES_COLLECTION].find_one({"messageId": message_id}, {"_id": 0})
     if not msg:
         return
     item = _sanitize_message(msg)
+    _record_group_write(group_id)
     now = int(time.time() * 1000)
-    # Append and keep last N items (ascending order as appended)
-    await db["read_messages_latest"].update_one(
+    # Append and keep last N items (ascending order as appended), reading the
+    # trimmed window back in the same round trip
+    doc = await db["read_messages_latest"].find_one_and_update(
         {"groupId": group_id},
         {
-            "$setOnInsert": {"groupId": group_id, "items": []},
+            # items is created by $push; naming it in $setOnInsert too is a path conflict
+            "$setOnInsert": {"groupId": group_id},
             "$push": {"items": {"$each": [item], "$slice": -int(window)}},
             "$set": {"updatedAt": now},
         },
+        projection={"_id": 0, "items": 1},
         upsert=True,
+        return_document=ReturnDocument.AFTER,
     )
-    # Refresh local caches for this group (best-effort)
-    try:
-        doc = await db["read_messages_latest"].find_one({"groupId": group_id}, {"_id": 0, "items": 1})
-        if doc and isinstance(doc.get("items"), list):
-            items = doc["items"]
-            for n in (50, 100):
-                key = f"messages:latest:{group_id}:{n}"
-                await local_cache.set(key, items[-n:], ttl_seconds=20)
-    except Exception:
-        pass
+    # Refresh local caches for this group
+    items = doc.get("items") if doc else None
+    if isinstance(items, list):
+        ttl = jittered_ttl(latest_ttl_for(group_id, 20))
+        for n in (50, 100):
+            local_cache.set_sync(f"messages:latest:{group_id}:{n}", items[-n:], ttl_seconds=ttl)
 
 
 async def event_stream_handler(topic: str, event: Dict[str, Any]) -> None:
@@ -60,12 +135,11 @@ async def event_stream_handler(topic: str, event: Dict[str, Any]) -> None:
         gid = str(event.get("groupId") or "")
         mid = str(event.get("messageId") or "")
         if gid and mid:
-            await _update_latest_messages(gid, mid)
+            await _update_latest_messages(gid, mid, event.get("message"))
             # Invalidate messages latest and page caches across instances
-            try:
-                await local_cache.delete_prefix(f"messages:latest:{gid}:")
-                await local_cache.delete_prefix(f"messages:page:{gid}:")
-                await publish_invalidate(f"messages:latest:{gid}:")
-                await publish_invalidate(f"messages:page:{gid}:")
-            except Exception:
-                pass
+            latest_prefix = f"messages:latest:{gid}:"
+            page_prefix = f"messages:page:{gid}:"
+            local_cache.delete_prefix_sync(latest_prefix)
+            local_cache.delete_prefix_sync(page_prefix)
+            # One PUBLISH for both prefixes (publish_invalidate never raises)
+            await publish_invalidate(latest_prefix, page_prefix)
@@ -1,21 +1,69 @@
 import asyncio
 import json
+import logging
+import os
 from typing import Any, Callable, Dict, Optional
 
+try:
+    import orjson as _orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson is listed in requirements
+    _orjson = None
+
 from redis.asyncio import Redis
 from redis.asyncio.client import PubSub
 
 from .config import get_settings
+from .utils.safe import EXPECTED_ERRORS
+
+LOGGER = logging.getLogger("uvicorn.error")
 
 _settings = get_settings()
 _client: Optional[Redis] = None
 _listener_task: Optional[asyncio.Task] = None
 _pubsub: Optional[PubSub] = None
+_channel_cache: Dict[str, str] = {}
+# Shared by publishes, cache reads/writes and SCANs; the subscriber holds one more
+_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+_WARM_CONNECTIONS = int(os.getenv("REDIS_WARM_CONNECTIONS", "8"))
+# orjson parses typical events in microseconds; only payloads this large are worth a thread hop
+_OFFLOAD_DECODE_BYTES = 64 * 1024
+
+# Outgoing events are buffered in a bounded queue and drained by a single task so a
+# slow or unavailable Redis caps memory instead of piling up awaiting callers.
+_PUBLISH_QUEUE_MAX = 10_000
+_PUBLISH_BATCH_MAX = 256
+# How long stop() waits for the queued backlog to be flushed before giving up
+_PUBLISH_FLUSH_TIMEOUT = 5.0
+# A None item tells the drainer to flush what precedes it and exit
+_publish_queue: Optional["asyncio.Queue[Optional[tuple[str, bytes]]]"] = None
+_publisher_task: Optional[asyncio.Task] = None
+_dropped_events = 0
 
 
 def _channel(topic: str) -> str:
-    prefix = (_settings.redis_pubsub_prefix or "").strip()
-    return f"{prefix}.{topic}" if prefix else topic
+    channel = _channel_cache.get(topic)
+    if channel is None:
+        prefix = (_settings.redis_pubsub_prefix or "").strip()
+        channel = _channel_cache.setdefault(topic, f"{prefix}.{topic}" if prefix else topic)
+    return channel
+
+
+_ENCODE_ERRORS = (_orjson.JSONEncodeError,) if _orjson is not None else (TypeError, ValueError)
+
+
+def _dumps(event: Dict[str, Any]) -> bytes:
+    if _orjson is not None:
+        return _orjson.dumps(event)
+    return json.dumps(event, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw: Any) -> Any:
+    if _orjson is not None:
+        # orjson parses bytes directly, skipping the intermediate str decode
+        return _orjson.loads(raw)
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode("utf-8")
+    return json.loads(raw)
 
 
 async def _ensure_client() -> Optional[Redis]:
@@ -29,6 +77,10 @@ async def _ensure_client() -> Optional[Redis]:
             _settings.redis_url,
             encoding="utf-8",
             decode_responses=False,
+            max_connections=_MAX_CONNECTIONS,
+            socket_keepalive=True,
+            health_check_interval=30,
+            retry_on_timeout=True,
         )
         await client.ping()
         _client = client
@@ -37,17 +89,85 @@ async def _ensure_client() -> Optional[Redis]:
     return _client
 
 
-async def publish(topic: str, event: Dict[str, Any]) -> None:
-    if not _settings.redis_pubsub_enabled:
-        return
+async def _flush_batch(batch: "list[tuple[str, bytes]]") -> None:
+    global _dropped_events
     client = await _ensure_client()
     if not client:
+        _dropped_events += len(batch)
         return
     try:
-        payload = json.dumps(event, separators=(",", ":")).encode("utf-8")
-        await client.publish(_channel(topic), payload)
-    except Exception:
-        pass
+        # One round trip for everything queued since the last flush
+        async with client.pipeline(transaction=False) as pipe:
+            for channel, payload in batch:
+                pipe.publish(channel, payload)
+            await pipe.execute()
+    except EXPECTED_ERRORS:
+        _dropped_events += len(batch)
+
+
+async def _drain_publish_queue(queue: "asyncio.Queue[Optional[tuple[str, bytes]]]") -> None:
+    global _dropped_events
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        batch = [item]
+        stopping = False
+        while len(batch) < _PUBLISH_BATCH_MAX and not queue.empty():
+            item = queue.get_nowait()
+            if item is None:
+                stopping = True
+                break
+            batch.append(item)
+        try:
+            await _flush_batch(batch)
+        except Exception:
+            # Keep draining: a dead drainer would strand everything queued behind it
+            _dropped_events += len(batch)
+            LOGGER.exception("Redis publish batch of %d events failed", len(batch))
+        if stopping:
+            return
+
+
+def _ensure_publisher() -> "asyncio.Queue[Optional[tuple[str, bytes]]]":
+    global _publish_queue, _publisher_task, _dropped_events
+    loop = asyncio.get_running_loop()
+    task = _publisher_task
+    if task is None or task.done() or task.get_loop() is not loop:
+        queue = _publish_queue
+        if queue is None or (task is not None and task.get_loop() is not loop):
+            if queue is not None:
+                # The backlog belongs to a loop that is gone; it can never be sent
+                _dropped_events += queue.qsize()
+            queue = asyncio.Queue(maxsize=_PUBLISH_QUEUE_MAX)
+        # Otherwise the drainer exited on this loop: keep its queue and backlog
+        _publish_queue = queue
+        _publisher_task = loop.create_task(_drain_publish_queue(queue))
+    return _publish_queue  # type: ignore[return-value]
+
+
+async def publish(topic: str, event: Dict[str, Any]) -> None:
+    """Enqueue an event for publishing. Returns without waiting on Redis."""
+    global _dropped_events
+    if not _settings.redis_pubsub_enabled or not _settings.redis_url:
+        return
+    try:
+        payload = _dumps(event)
+    except _ENCODE_ERRORS:
+        return
+    try:
+        _ensure_publisher().put_nowait((_channel(topic), payload))
+    except asyncio.QueueFull:
+        _dropped_events += 1
+
+
+def publish_stats() -> Dict[str, int]:
+    """Return the outgoing queue depth and the number of events dropped.
+
+    Events are dropped when the queue is full or when Redis is unavailable at flush time.
+    """
+    queued = _publish_queue.qsize() if _publish_queue is not None else 0
+    return {"queued": queued, "dropped": _dropped_events}
 
 
 async def start_consumer(handler: Callable[[str, Dict[str, Any]], asyncio.Future]) -> None:
@@ -59,6 +179,11 @@ async def start_consumer(handler: Callable[[str, Dict[str, Any]], asyncio.Future
     client = await _ensure_client()
     if not client:
         return
+    # Open a few pooled connections now so the first burst of requests doesn't pay for connects
+    try:
+        await asyncio.gather(*(client.ping() for _ in range(max(0, _WARM_CONNECTIONS))))
+    except Exception:
+        pass
 
     async def _run() -> None:
         nonlocal client
@@ -67,19 +192,22 @@ async def start_consumer(handler: Callable[[str, Dict[str, Any]], asyncio.Future
         try:
             await pubsub.subscribe(*_topics)
             _pubsub = pubsub
-            async for message in pubsub.listen():
-                if message.get("type") != "message":
+            while True:
+                # Blocks until the next publication; subscribe confirmations are filtered by redis-py
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+                if message is None:
                     continue
                 raw_channel = message.get("channel")
                 raw_data = message.get("data")
                 try:
                     channel = raw_channel.decode("utf-8") if isinstance(raw_channel, (bytes, bytearray)) else str(raw_channel)
-                    if isinstance(raw_data, (bytes, bytearray)):
-                        payload = json.loads(raw_data.decode("utf-8"))
+                    if isinstance(raw_data, (bytes, bytearray)) and len(raw_data) > _OFFLOAD_DECODE_BYTES:
+                        payload = await asyncio.to_thread(_loads, raw_data)
                     else:
-                        payload = json.loads(raw_data)
+                        payload = _loads(raw_data)
                 except Exception:
                     continue
+                # Awaited in order: message_created events must reach the read model sequentially
                 try:
                     await handler(channel, payload)
                 except Exception:
@@ -99,7 +227,31 @@ async def start_consumer(handler: Callable[[str, Dict[str, Any]], asyncio.Future
 
 
 async def stop() -> None:
-    global _listener_task, _pubsub, _client
+    global _listener_task, _pubsub, _client, _publisher_task, _publish_queue, _dropped_events
+    if _publisher_task is not None:
+        # Let the drainer flush everything queued so far, then exit on the sentinel
+        try:
+            if not _publisher_task.done() and _publish_queue is not None:
+                await asyncio.wait_for(_publish_queue.put(None), _PUBLISH_FLUSH_TIMEOUT)
+                await asyncio.wait_for(asyncio.shield(_publisher_task), _PUBLISH_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            LOGGER.warning("Timed out flushing queued Redis publishes on shutdown")
+        except Exception:
+            pass
+        _publisher_task.cancel()
+        try:
+            await _publisher_task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            pass
+        if _publish_queue is not None:
+            # Whatever is still queued (sentinel aside) was not flushed in time
+            while not _publish_queue.empty():
+                if _publish_queue.get_nowait() is not None:
+                    _dropped_events += 1
+        _publisher_task = None
+        _publish_queue = None
     if _listener_task is not None:
         _listener_task.cancel()
         try:
@@ -1,33 +1,46 @@
 import json
 from typing import Any, Optional
 
+try:
+    import orjson as _orjson  # type: ignore
+except Exception:  # pragma: no cover - orjson is listed in requirements
+    _orjson = None
+
 from .config import get_settings
 from .redis_bus import get_client
+from .utils.safe import EXPECTED_ERRORS, safe_await
 
 _settings = get_settings()
 _CACHE_NAMESPACE = "cache:"
+_SCAN_COUNT = 1000
+_DELETE_BATCH = 256
+# Values that cannot be serialized are simply not cached
+_ENCODE_ERRORS = (_orjson.JSONEncodeError,) if _orjson is not None else (TypeError, ValueError)
+
+
+_PREFIX = (_settings.redis_pubsub_prefix or "").strip()
+# Settings are fixed for the process lifetime, so the namespace is built once
+_KEY_NAMESPACE = f"{_PREFIX}:{_CACHE_NAMESPACE}" if _PREFIX else _CACHE_NAMESPACE
 
 
 def _redis_key(key: str) -> str:
-    prefix = (_settings.redis_pubsub_prefix or "").strip()
-    ns = _CACHE_NAMESPACE
-    if prefix:
-        ns = f"{prefix}:{_CACHE_NAMESPACE}"
-    return f"{ns}{key}"
+    return _KEY_NAMESPACE + key
 
 
 async def get(key: str) -> Optional[Any]:
     client = await get_client()
     if not client:
         return None
+    raw = await safe_await(client.get(_redis_key(key)))
+    if raw is None:
+        return None
     try:
-        raw = await client.get(_redis_key(key))
-        if raw is None:
-            return None
+        if _orjson is not None:
+            return _orjson.loads(raw)
         if isinstance(raw, (bytes, bytearray)):
             raw = raw.decode("utf-8")
         return json.loads(raw)
-    except Exception:
+    except ValueError:
         return None
 
 
@@ -36,11 +49,26 @@ async def set(key: str, value: Any, ttl_seconds: int) -> None:
     if not client:
         return
     try:
-        payload = json.dumps(value, separators=(",", ":"))
-        ttl = max(1, int(ttl_seconds))
-        await client.set(_redis_key(key), payload, ex=ttl)
-    except Exception:
-        pass
+        if _orjson is not None:
+            # NON_STR_KEYS matches json.dumps, which coerces int keys to strings
+            payload = _orjson.dumps(value, option=_orjson.OPT_NON_STR_KEYS)
+        else:
+            payload = json.dumps(value, separators=(",", ":"))
+    except _ENCODE_ERRORS:
+        return
+    ttl = max(1, int(ttl_seconds))
+    await safe_await(client.set(_redis_key(key), payload, ex=ttl))
+
+
+async def delete(*keys: str) -> int:
+    client = await get_client()
+    if not client or not keys:
+        return 0
+    return await _unlink(client, [_redis_key(key) for key in keys])
+
+
+async def _unlink(client, names: list) -> int:
+    return int(await safe_await(client.unlink(*names), default=0) or 0)
 
 
 async def delete_prefix(prefix: str) -> int:
@@ -49,13 +77,16 @@ async def delete_prefix(prefix: str) -> int:
         return 0
     pattern = _redis_key(prefix) + "*"
     deleted = 0
+    batch: list = []
     try:
-        async for name in client.scan_iter(match=pattern):
-            try:
-                await client.delete(name)
-                deleted += 1
-            except Exception:
-                continue
-    except Exception:
+        # One UNLINK per batch of scanned keys; the server frees memory in the background
+        async for name in client.scan_iter(match=pattern, count=_SCAN_COUNT):
+            batch.append(name)
+            if len(batch) >= _DELETE_BATCH:
+                deleted += await _unlink(client, batch)
+                batch = []
+        if batch:
+            deleted += await _unlink(client, batch)
+    except EXPECTED_ERRORS:
         return deleted
     return deleted
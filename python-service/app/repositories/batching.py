@@ -0,0 +1,137 @@
+"""Coalesce concurrent single-document lookups into one ``$in`` query."""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any, Dict, Hashable, Mapping, Optional, Set
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+DEFAULT_MAX_BATCH = 64
+
+
+class BatchLoader:
+    """Batch ``find_one({field: key})`` calls issued during the same loop tick.
+
+    Lookups are queued and flushed on the next iteration of the event loop (or
+    as soon as ``max_batch`` distinct keys are pending) with a single
+    ``find({field: {"$in": keys}})``. Concurrent lookups for the same key share
+    one result. Nothing is cached beyond the flush, so reads never go stale.
+    An optional ``projection`` is applied to every query; it must keep ``field``.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        field: str,
+        *,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        projection: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        self._collection = collection
+        self._field = field
+        self._projection = dict(projection) if projection else None
+        self._max_batch = max(1, max_batch)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+        # The loop only holds weak references to tasks; keep in-flight batches alive
+        self._running: Set[asyncio.Task] = set()
+
+    async def load(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Loader reused from another loop (e.g. between tests): start fresh
+            self._loop = loop
+            self._pending = {}
+            self._flush_handle = None
+
+        future = self._pending.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self._max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_soon(self._flush)
+        # Shield so one cancelled caller does not cancel the lookup for the others
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: Dict[Hashable, asyncio.Future]) -> None:
+        try:
+            if len(batch) == 1:
+                (key,) = batch
+                docs = [await self._collection.find_one({self._field: key}, self._projection)]
+            else:
+                cursor = self._collection.find({self._field: {"$in": list(batch)}}, self._projection)
+                docs = await cursor.to_list(length=None)
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+                    # Mark retrieved in case every awaiting caller was cancelled
+                    future.exception()
+            return
+
+        by_key: Dict[Hashable, Dict[str, Any]] = {}
+        for doc in docs:
+            if doc is not None:
+                by_key.setdefault(doc.get(self._field), doc)
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(by_key.get(key))
+
+
+# (id(client), database name) -> (weak ref to the client, loaders). Driver database
+# objects are not necessarily hashable, so the registry is keyed on the client's
+# identity; the weak ref detects an id reused by a later client.
+_LOADERS: Dict[tuple, tuple["weakref.ref[Any]", Dict[tuple, BatchLoader]]] = {}
+
+
+def _loaders_for(database: AsyncIOMotorDatabase) -> Dict[tuple, BatchLoader]:
+    client = database.client
+    registry_key = (id(client), database.name)
+    entry = _LOADERS.get(registry_key)
+    if entry is not None and entry[0]() is client:
+        return entry[1]
+    # Forget loaders bound to clients that have been closed and collected
+    for stale in [key for key, (ref, _) in _LOADERS.items() if ref() is None]:
+        del _LOADERS[stale]
+    loaders: Dict[tuple, BatchLoader] = {}
+    _LOADERS[registry_key] = (weakref.ref(client), loaders)
+    return loaders
+
+
+def get_batch_loader(
+    database: AsyncIOMotorDatabase,
+    collection_name: str,
+    field: str,
+    *,
+    projection: Optional[Mapping[str, Any]] = None,
+) -> BatchLoader:
+    """Return the loader shared by every repository bound to ``database``.
+
+    Repositories are cheap and created per request, so loaders are kept per
+    database (client and name) rather than per repository instance.
+    """
+
+    loaders = _loaders_for(database)
+    key = (collection_name, field, tuple(sorted(projection.items())) if projection else None)
+    loader = loaders.get(key)
+    if loader is None:
+        loader = loaders[key] = BatchLoader(database[collection_name], field, projection=projection)
+    return loader
+
+
+__all__ = ["BatchLoader", "get_batch_loader"]
@@ -11,6 +11,7 @@ from pymongo import ReturnDocument
 
 from ..db.collections import DATING_PROFILES_COLLECTION
 from ..models.dating_profile import DatingProfileDocument
+from .documents import construct_document
 from .exceptions import NotFoundRepositoryError
 
 LOGGER = logging.getLogger("uvicorn.error")
@@ -31,11 +32,11 @@ class DatingProfileRepository:
         self, user_profile_id: ObjectId
     ) -> Optional[DatingProfileDocument]:
         doc = await self._collection.find_one({"userProfileId": user_profile_id})
-        return DatingProfileDocument(**doc) if doc else None
+        return construct_document(DatingProfileDocument, doc) if doc else None
 
     async def get_by_user_id(self, user_id: str) -> Optional[DatingProfileDocument]:
         doc = await self._collection.find_one({"userId": user_id})
-        return DatingProfileDocument(**doc) if doc else None
+        return construct_document(DatingProfileDocument, doc) if doc else None
 
     async def upsert_profile(
         self,
@@ -67,7 +68,7 @@ class DatingProfileRepository:
         )
         if not doc:  # pragma: no cover - defensive, Motor should return doc on upsert
             raise NotFoundRepositoryError("dating profile upsert failed")
-        return DatingProfileDocument(**doc)
+        return construct_document(DatingProfileDocument, doc)
 
     async def delete_by_user_profile_id(self, user_profile_id: ObjectId) -> bool:
         result = await self._collection.delete_one({"userProfileId": user_profile_id})
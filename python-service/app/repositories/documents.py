@@ -0,0 +1,51 @@
+"""Build repository models from trusted MongoDB documents without re-validating."""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import Any, Dict, Mapping, Type, TypeVar
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@cache
+def _field_names_by_key(model: Type[BaseModel]) -> Dict[str, str]:
+    """Map every accepted input key (alias and field name) to its field name."""
+
+    mapping: Dict[str, str] = {}
+    for name, field in model.model_fields.items():
+        mapping[name] = name
+        if field.alias:
+            mapping[field.alias] = name
+    return mapping
+
+
+def construct_document(model: Type[ModelT], doc: Mapping[str, Any]) -> ModelT:
+    """Return ``model`` populated from ``doc`` via ``model_construct``.
+
+    Documents read back from our own collections were written by the
+    repositories, so full validation only repeats work. Keys are translated
+    from their Mongo aliases once per model; unknown keys are kept only when
+    the model allows extras, mirroring what validation would do.
+    """
+
+    names = _field_names_by_key(model)
+    keep_extra = model.model_config.get("extra") == "allow"
+    values: Dict[str, Any] = {}
+    extra: Dict[str, Any] = {}
+    for key, value in doc.items():
+        name = names.get(key)
+        if name is not None:
+            values[name] = value
+        elif keep_extra:
+            extra[key] = value
+    instance = model.model_construct(**values)
+    if extra:
+        # Bypass __setattr__ so frozen models can be populated too
+        object.__setattr__(instance, "__pydantic_extra__", extra)
+    return instance
+
+
+__all__ = ["construct_document"]
@@ -3,19 +3,54 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, Optional
+import os
+from typing import Iterable, NamedTuple, Optional
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
 from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
+from .. import redis_cache
+from ..cache import cache as local_cache
+from ..cache_bus import publish_invalidate_keys
 from ..db.collections import USER_PROFILES_COLLECTION
 from ..models.user_profile import UserProfileDocument
+from .batching import get_batch_loader
+from .documents import construct_document
 from .exceptions import DuplicateKeyRepositoryError, NotFoundRepositoryError
 
 LOGGER = logging.getLogger("uvicorn.error")
 
+# Redis read-through cache for profile lookups (no-op when Redis is not configured)
+_CACHE_TTL_SECONDS = int(os.getenv("USER_PROFILE_CACHE_TTL", "60"))
+# Short-lived process-local copy in front of Redis/Mongo for chatty authenticated
+# clients; updates drop it here and on other instances via the cache bus
+_LOCAL_TTL_SECONDS = int(os.getenv("USER_PROFILE_LOCAL_CACHE_TTL", "5"))
+
+
+def _by_id_key(user_id: str) -> str:
+    return f"user:by_id:{user_id}"
+
+
+def _by_username_key(username_lower: str) -> str:
+    return f"user:by_uname:{username_lower}"
+
+
+_AUTH_MATERIAL_PROJECTION = {"_id": 1, "userId": 1, "username": 1, "passwordHash": 1}
+# Only login needs the bcrypt hash (see get_auth_material_by_username); every other
+# read leaves it on the server, and out of the Redis cache
+_PROFILE_PROJECTION = {"passwordHash": 0}
+
+
+class AuthMaterial(NamedTuple):
+    """The fields needed to check a login, without the rest of the profile."""
+
+    id: ObjectId
+    user_id: str
+    username: str
+    password_hash: str
+
 
 class UserProfileRepository:
     """Thin abstraction over the user profile MongoDB collection."""
@@ -23,6 +58,16 @@ class UserProfileRepository:
     def __init__(self, database: AsyncIOMotorDatabase) -> None:
         self._database = database
         self._collection: AsyncIOMotorCollection = database[USER_PROFILES_COLLECTION]
+        # Concurrent point lookups across requests are coalesced into one $in query
+        self._by_user_id = get_batch_loader(
+            database, USER_PROFILES_COLLECTION, "userId", projection=_PROFILE_PROJECTION
+        )
+        self._by_object_id = get_batch_loader(
+            database, USER_PROFILES_COLLECTION, "_id", projection=_PROFILE_PROJECTION
+        )
+        self._by_username = get_batch_loader(
+            database, USER_PROFILES_COLLECTION, "usernameLower", projection=_PROFILE_PROJECTION
+        )
 
     @property
     def collection(self) -> AsyncIOMotorCollection:
@@ -57,19 +102,80 @@ class UserProfileRepository:
         except DuplicateKeyError as exc:  # pragma: no cover - exercised via service layer tests
             LOGGER.debug("Duplicate user profile insertion for username=%s", username)
             raise DuplicateKeyRepositoryError("username already exists") from exc
-        return UserProfileDocument(**doc)
+        return construct_document(UserProfileDocument, doc)
+
+    async def _cache_profile(self, profile: UserProfileDocument) -> None:
+        if _LOCAL_TTL_SECONDS > 0:
+            # Documents are frozen, so the instance itself can be shared
+            local_cache.set_sync(_by_id_key(profile.user_id), profile, _LOCAL_TTL_SECONDS)
+        await redis_cache.set(
+            _by_id_key(profile.user_id),
+            profile.model_dump(by_alias=True, exclude={"password_hash"}),
+            ttl_seconds=_CACHE_TTL_SECONDS,
+        )
+        # The username key only points at the userId so renames never leave a stale copy
+        await redis_cache.set(
+            _by_username_key(profile.username_lower),
+            profile.user_id,
+            ttl_seconds=_CACHE_TTL_SECONDS,
+        )
+
+    async def _cached_by_user_id(self, user_id: str) -> Optional[UserProfileDocument]:
+        cached = await redis_cache.get(_by_id_key(user_id))
+        if not isinstance(cached, dict):
+            return None
+        try:
+            cached["_id"] = ObjectId(cached["_id"])
+        except Exception:
+            return None
+        # Entries written before the hash was excluded may still carry it
+        cached.pop("passwordHash", None)
+        return construct_document(UserProfileDocument, cached)
 
     async def get_by_username(self, username: str) -> Optional[UserProfileDocument]:
-        doc = await self._collection.find_one({"usernameLower": username.lower()})
-        return UserProfileDocument(**doc) if doc else None
+        username_lower = username.lower()
+        cached_user_id = await redis_cache.get(_by_username_key(username_lower))
+        if isinstance(cached_user_id, str):
+            profile = await self.get_by_user_id(cached_user_id)
+            if profile is not None and profile.username_lower == username_lower:
+                return profile
+        doc = await self._by_username.load(username_lower)
+        if not doc:
+            return None
+        profile = construct_document(UserProfileDocument, doc)
+        await self._cache_profile(profile)
+        return profile
+
+    async def get_auth_material_by_username(self, username: str) -> Optional[AuthMaterial]:
+        """Fetch only what a password check needs (no friends list, no model build)."""
+
+        doc = await self._collection.find_one(
+            {"usernameLower": username.lower()},
+            projection=_AUTH_MATERIAL_PROJECTION,
+        )
+        if not doc:
+            return None
+        return AuthMaterial(doc["_id"], doc["userId"], doc["username"], doc["passwordHash"])
 
     async def get_by_user_id(self, user_id: str) -> Optional[UserProfileDocument]:
-        doc = await self._collection.find_one({"userId": user_id})
-        return UserProfileDocument(**doc) if doc else None
+        profile = local_cache.get_sync(_by_id_key(user_id))
+        if profile is not None:
+            return profile
+        profile = await self._cached_by_user_id(user_id)
+        if profile is not None:
+            if _LOCAL_TTL_SECONDS > 0:
+                local_cache.set_sync(_by_id_key(user_id), profile, _LOCAL_TTL_SECONDS)
+            return profile
+        doc = await self._by_user_id.load(user_id)
+        if not doc:
+            return None
+        profile = construct_document(UserProfileDocument, doc)
+        await self._cache_profile(profile)
+        return profile
 
     async def get_by_object_id(self, object_id: ObjectId) -> Optional[UserProfileDocument]:
-        doc = await self._collection.find_one({"_id": object_id})
-        return UserProfileDocument(**doc) if doc else None
+        doc = await self._by_object_id.load(object_id)
+        return construct_document(UserProfileDocument, doc) if doc else None
 
     async def update_profile(
         self,
@@ -79,14 +185,23 @@ class UserProfileRepository:
     ) -> UserProfileDocument:
         """Update a profile identified by its userId."""
 
-        result = await self._collection.find_one_and_update(
-            {"userId": user_id},
-            {"$set": updates},
-            return_document=ReturnDocument.AFTER,
-        )
+        try:
+            result = await self._collection.find_one_and_update(
+                {"userId": user_id},
+                {"$set": updates},
+                projection=_PROFILE_PROJECTION,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError as exc:
+            LOGGER.debug("Duplicate username on profile update for userId=%s", user_id)
+            raise DuplicateKeyRepositoryError("username already exists") from exc
         if not result:
             raise NotFoundRepositoryError("user profile not found")
-        return UserProfileDocument(**result)
+        key = _by_id_key(user_id)
+        local_cache.delete_sync(key)
+        await redis_cache.delete(key)
+        await publish_invalidate_keys(key)
+        return construct_document(UserProfileDocument, result)
 
     async def username_exists(
         self,
@@ -97,8 +212,8 @@ class UserProfileRepository:
         query: dict[str, object] = {"usernameLower": username.lower()}
         if exclude_user_id:
             query["userId"] = {"$ne": exclude_user_id}
-        doc = await self._collection.find_one(query, projection={"_id": 1})
-        return doc is not None
+        # limit=1 lets the server stop at the first index match; only a count comes back
+        return await self._collection.count_documents(query, limit=1) > 0
 
 
-__all__ = ["UserProfileRepository"]
+__all__ = ["AuthMaterial", "UserProfileRepository"]
@@ -1,15 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
 from ..models.user_profile import (
     AuthTokenResponse,
     UserLoginRequest,
-    UserProfile,
     UserSignupRequest,
 )
-from ..repositories.exceptions import (
-    DuplicateKeyRepositoryError,
-    NotFoundRepositoryError,
-)
+from ..repositories.exceptions import DuplicateKeyRepositoryError
 from ..services.user_profile_service import (
     UserProfileService,
     get_user_profile_service,
@@ -26,7 +23,7 @@ async def signup(
     service: UserProfileService = Depends(get_user_profile_service),
 ):
     ip = request.client.host if request.client else "unknown"
-    if not service.allow_rate(f"signup:{ip}"):
+    if not await service.allow_rate(f"signup:{ip}"):
         raise HTTPException(status_code=429, detail="rate limit exceeded")
     try:
         profile_doc = await service.register_user(body)
@@ -36,9 +33,8 @@ async def signup(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     token = service.issue_token(profile_doc.user_id, profile_doc.username)
-    payload = service.redact_profile_document(profile_doc)
-    profile = UserProfile(**payload)
-    return AuthTokenResponse(token=token, profile=profile)
+    # Same shape as AuthTokenResponse, without re-validating it against response_model
+    return ORJSONResponse({"token": token, "profile": service.to_public_payload(profile_doc)})
 
 
 @router.post("/auth/login", response_model=AuthTokenResponse)
@@ -48,18 +44,15 @@ async def login(
     service: UserProfileService = Depends(get_user_profile_service),
 ):
     ip = request.client.host if request.client else "unknown"
-    if not service.allow_rate(f"login:{ip}"):
+    if not await service.allow_rate(f"login:{ip}"):
         raise HTTPException(status_code=429, detail="rate limit exceeded")
     try:
         profile_doc = await service.authenticate_user(body)
-    except NotFoundRepositoryError:
-        raise HTTPException(status_code=404, detail="user not found") from None
     except PermissionError:
         raise HTTPException(status_code=401, detail="invalid credentials") from None
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     token = service.issue_token(profile_doc.user_id, profile_doc.username)
-    payload = service.redact_profile_document(profile_doc)
-    profile = UserProfile(**payload)
-    return AuthTokenResponse(token=token, profile=profile)
+    # Same shape as AuthTokenResponse, without re-validating it against response_model
+    return ORJSONResponse({"token": token, "profile": service.to_public_payload(profile_doc)})
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query, Request, Response
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 from ..db import get_dating_db, get_db, get_user_db
 from ..db.collections import DATING_PROFILES_COLLECTION, LIKES_COLLECTION, USER_PROFILES_COLLECTION
 from ..cache import cache as local_cache
@@ -9,7 +9,8 @@ import json
 import math
 import re
 import time
-from urllib.parse import urlparse
+from bisect import bisect_left
+from functools import lru_cache
 from bson import ObjectId  # type: ignore
 from ..config import get_settings
 from ..services.user_profile_service import get_current_profile
@@ -31,6 +32,35 @@ SECONDARY_PHOTO_LIMIT = 8
 _EARTH_RADIUS_M = 6_371_000.0
 
 
+# A coordinate in radians together with cos(latitude), so each point pays for its
+# trigonometry once however many distances it takes part in
+GeoPoint = Tuple[float, float, float]
+
+# Upper bounds (km) of the distance buckets used by _score_location and their score/level
+_LOCATION_BUCKET_LIMITS_KM = (25.0, 100.0, 250.0, 500.0, 1500.0)
+_LOCATION_BUCKET_SCORES = (30.0, 26.0, 22.0, 18.0, 12.0, 6.0)
+_LOCATION_BUCKET_LEVELS = ("same-area", "nearby", "regional", "same-state", "same-country", "distant")
+
+
+def _geo_point(lat: Optional[float], lon: Optional[float]) -> Optional[GeoPoint]:
+    try:
+        if lat is None or lon is None:
+            return None
+        phi = math.radians(float(lat))
+        lam = math.radians(float(lon))
+    except (TypeError, ValueError):
+        return None
+    return (phi, lam, math.cos(phi))
+
+
+def _geo_distance_m(a: GeoPoint, b: GeoPoint) -> float:
+    """Haversine distance in meters between two precomputed points."""
+    sin_dphi = math.sin((b[0] - a[0]) * 0.5)
+    sin_dlambda = math.sin((b[1] - a[1]) * 0.5)
+    h = sin_dphi * sin_dphi + a[2] * b[2] * sin_dlambda * sin_dlambda
+    return _EARTH_RADIUS_M * 2.0 * math.atan2(math.sqrt(h), math.sqrt(max(0.0, 1.0 - h)))
+
+
 def _haversine_distance_m(
     lat1: Optional[float],
     lon1: Optional[float],
@@ -38,21 +68,11 @@ def _haversine_distance_m(
     lon2: Optional[float],
 ) -> Optional[float]:
     """Return the great-circle distance in meters between two coordinates."""
-    try:
-        if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
-            return None
-        phi1 = math.radians(float(lat1))
-        phi2 = math.radians(float(lat2))
-        dphi = math.radians(float(lat2) - float(lat1))
-        dlambda = math.radians(float(lon2) - float(lon1))
-    except (TypeError, ValueError):
+    a = _geo_point(lat1, lon1)
+    b = _geo_point(lat2, lon2)
+    if a is None or b is None:
         return None
-
-    sin_dphi = math.sin(dphi / 2.0)
-    sin_dlambda = math.sin(dlambda / 2.0)
-    a = sin_dphi * sin_dphi + math.cos(phi1) * math.cos(phi2) * sin_dlambda * sin_dlambda
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(max(0.0, 1 - a)))
-    return float(_EARTH_RADIUS_M * c)
+    return _geo_distance_m(a, b)
 
 
 def _build_geojson_point(lat: float, lon: float) -> Dict[str, Any]:
@@ -86,31 +106,38 @@ def _clean_text(value: Any, max_len: int = 120) -> Optional[str]:
     return cleaned
 
 
+_GENDER_LOOKUP: Dict[str, str] = {"female": "Female", "male": "Male"}
+
+_INTEREST_LOOKUP: Dict[str, str] = {
+    "female": "Female",
+    "woman": "Female",
+    "women": "Female",
+    "male": "Male",
+    "man": "Male",
+    "men": "Male",
+    "everyone": "Everyone",
+    "everybody": "Everyone",
+    "all": "Everyone",
+    "any": "Everyone",
+}
+
+
 def _canonical_gender(value: Any) -> Optional[str]:
     text = _clean_text(value, 16)
     if not text:
         return None
-    lookup = {"female": "Female", "male": "Male"}
-    return lookup.get(text.lower())
+    return _GENDER_LOOKUP.get(text.lower())
 
 
 def _canonical_interest(value: Any) -> Optional[str]:
     text = _clean_text(value, 24)
     if not text:
         return None
-    lookup = {
-        "female": "Female",
-        "woman": "Female",
-        "women": "Female",
-        "male": "Male",
-        "man": "Male",
-        "men": "Male",
-        "everyone": "Everyone",
-        "everybody": "Everyone",
-        "all": "Everyone",
-        "any": "Everyone",
-    }
-    return lookup.get(text.lower())
+    return _INTEREST_LOOKUP.get(text.lower())
+
+
+# http(s) scheme followed by a non-empty host; this is all _clean_url needs from urlparse
+_HTTP_URL_PATTERN = re.compile(r"https?://[^/?#\s]", re.IGNORECASE)
 
 
 def _clean_url(value: Any, max_len: int = 512) -> Optional[str]:
@@ -121,13 +148,7 @@ def _clean_url(value: Any, max_len: int = 512) -> Optional[str]:
         return None
     if len(url_text) > max_len:
         url_text = url_text[:max_len]
-    try:
-        parsed = urlparse(url_text)
-    except Exception:
-        return None
-    if parsed.scheme not in {"http", "https"}:
-        return None
-    if not parsed.netloc:
+    if not _HTTP_URL_PATTERN.match(url_text):
         return None
     return url_text
 
@@ -168,7 +189,7 @@ def _coerce_int(
     return num
 
 
-_MATCH_STOPWORDS: Set[str] = {
+_MATCH_STOPWORDS: FrozenSet[str] = frozenset({
     "about",
     "along",
     "also",
@@ -177,7 +198,6 @@ _MATCH_STOPWORDS: Set[str] = {
     "because",
     "being",
     "can't",
-    "can't",
     "cant",
     "don't",
     "dont",
@@ -209,24 +229,18 @@ _MATCH_STOPWORDS: Set[str] = {
     "your",
     "you're",
     "yours",
-}
+})
 
-_TOKEN_PATTERN = re.compile(r"[a-z0-9']+") 
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
 
 
 def _tokenize_keywords(*values: Any) -> Set[str]:
-    tokens: Set[str] = set()
-    for raw in values:
-        if not isinstance(raw, str):
-            continue
-        for token in _TOKEN_PATTERN.findall(raw.lower()):
-            cleaned = token.strip("'")
-            if len(cleaned) < 3:
-                continue
-            if cleaned in _MATCH_STOPWORDS:
-                continue
-            tokens.add(cleaned)
-    return tokens
+    # One lower() and one regex pass over all fields; the space keeps tokens from
+    # running across field boundaries
+    joined = " ".join(raw for raw in values if isinstance(raw, str)).lower()
+    tokens = {token.strip("'") for token in _TOKEN_PATTERN.findall(joined)}
+    tokens.difference_update(_MATCH_STOPWORDS)
+    return {token for token in tokens if len(token) >= 3}
 
 
 def _synchronize_name_fields(doc: Dict[str, Any]) -> None:
@@ -479,6 +493,42 @@ PROFILE_CLEAR_FIELDS: Tuple[str, ...] = (
     + LEGACY_PROFILE_FIELDS
 )
 
+_RELATIONSHIP_OPTIONS_BY_LOWER: Dict[str, str] = {option.lower(): option for option in RELATIONSHIP_OPTIONS}
+
+_RELATIONSHIP_LEGACY_MAP: Dict[str, str] = {
+    "friendship": "New friends",
+    "romance/dating": "Something casual",
+    "long term relationship": "Long-term partner",
+    "serious relationship": "Life partner",
+}
+
+
+def _normalize_relationship_entry(entry: Any) -> Optional[str]:
+    text = _clean_text(entry, 80)
+    if not text:
+        return None
+    lower = text.lower()
+    option = _RELATIONSHIP_OPTIONS_BY_LOWER.get(lower)
+    if option:
+        return option
+
+    if "friend" in lower:
+        return "New friends"
+    if "casual" in lower or "romance" in lower or "dating" in lower:
+        return "Something casual"
+    if "long term" in lower or "long-term" in lower or "longterm" in lower:
+        return "Long-term partner"
+    if "life partner" in lower or "life-partner" in lower or "serious" in lower:
+        return "Life partner"
+    if "figure" in lower or "not sure" in lower or "unsure" in lower or "undecided" in lower:
+        return "Still figuring it out"
+
+    mapped = _RELATIONSHIP_LEGACY_MAP.get(lower)
+    if mapped:
+        return mapped
+    return text
+
+
 def _canonical_relationship_list(raw: Any) -> List[str]:
     items: List[str] = []
     if raw is None:
@@ -488,40 +538,9 @@ def _canonical_relationship_list(raw: Any) -> List[str]:
     else:
         source = [raw]
 
-    def _normalize_entry(entry: Any) -> Optional[str]:
-        text = _clean_text(entry, 80)
-        if not text:
-            return None
-        lower = text.lower()
-        for option in RELATIONSHIP_OPTIONS:
-            if option.lower() == lower:
-                return option
-
-        if "friend" in lower:
-            return "New friends"
-        if "casual" in lower or "romance" in lower or "dating" in lower:
-            return "Something casual"
-        if "long term" in lower or "long-term" in lower or "longterm" in lower:
-            return "Long-term partner"
-        if "life partner" in lower or "life-partner" in lower or "serious" in lower:
-            return "Life partner"
-        if "figure" in lower or "not sure" in lower or "unsure" in lower or "undecided" in lower:
-            return "Still figuring it out"
-
-        legacy_map = {
-            "friendship": "New friends",
-            "romance/dating": "Something casual",
-            "long term relationship": "Long-term partner",
-            "serious relationship": "Life partner",
-        }
-        mapped = legacy_map.get(lower)
-        if mapped:
-            return mapped
-        return text
-
     seen = set()
     for entry in source:
-        normalized = _normalize_entry(entry)
+        normalized = _normalize_relationship_entry(entry)
         if not normalized:
             continue
         key = normalized.lower()
@@ -536,9 +555,8 @@ def _canonical_relationship_list(raw: Any) -> List[str]:
     items_lower = [value.lower() for value in items]
     ordered: List[str] = []
     added = set()
-    for option in RELATIONSHIP_OPTIONS:
-        key = option.lower()
-        if key in items_lower and key not in added:
+    for key, option in _RELATIONSHIP_OPTIONS_BY_LOWER.items():
+        if key in seen and key not in added:
             ordered.append(option)
             added.add(key)
     for entry, key in zip(items, items_lower):
@@ -844,10 +862,20 @@ def _normalize_location(raw: Any) -> Optional[Dict[str, Any]]:
     return location or None
 
 
+# Lifestyle answers come from a handful of UI options (plus some legacy free text),
+# so the keyword rules below are evaluated once per distinct answer and memoized
+_LIFESTYLE_LABEL_CACHE_SIZE = 512
+
+
 def _canonical_smoking(value: Any) -> Optional[str]:
     text = _clean_text(value, 80)
     if not text:
         return None
+    return _smoking_label(text)
+
+
+@lru_cache(maxsize=_LIFESTYLE_LABEL_CACHE_SIZE)
+def _smoking_label(text: str) -> str:
     lower = text.lower()
     if "don't" in lower or "dont" in lower or "non" in lower:
         return "Don't smoke"
@@ -862,6 +890,11 @@ def _canonical_drinking(value: Any) -> Optional[str]:
     text = _clean_text(value, 80)
     if not text:
         return None
+    return _drinking_label(text)
+
+
+@lru_cache(maxsize=_LIFESTYLE_LABEL_CACHE_SIZE)
+def _drinking_label(text: str) -> str:
     lower = text.lower()
     if "don't" in lower or "dont" in lower or "non" in lower:
         return "Don't drink"
@@ -876,6 +909,11 @@ def _canonical_children(value: Any) -> Optional[str]:
     text = _clean_text(value, 120)
     if not text:
         return None
+    return _children_label(text)
+
+
+@lru_cache(maxsize=_LIFESTYLE_LABEL_CACHE_SIZE)
+def _children_label(text: str) -> str:
     lower = text.lower()
     if lower.startswith("no") or "none" in lower:
         return "No"
@@ -890,6 +928,11 @@ def _canonical_relocation(value: Any) -> Optional[str]:
     text = _clean_text(value, 120)
     if not text:
         return None
+    return _relocation_label(text)
+
+
+@lru_cache(maxsize=_LIFESTYLE_LABEL_CACHE_SIZE)
+def _relocation_label(text: str) -> str:
     lower = text.lower()
     if "within" in lower and "country" in lower:
         return "Willing to relocate within my country"
@@ -932,12 +975,8 @@ def _extract_lifestyle(doc: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _prepare_match_profile(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    if not doc or not isinstance(doc, dict):
-        return None
-    if not _has_visible_dating_profile(doc):
-        return None
-
+def _match_location(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Location part of a match profile (see ``_prepare_match_profile``)."""
     location_raw = doc.get("location") if isinstance(doc.get("location"), dict) else None
     if not isinstance(location_raw, dict):
         location_raw = {}
@@ -956,6 +995,33 @@ def _prepare_match_profile(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str,
             if lon is None:
                 lon = coords.get("lon")
 
+    return {
+        "lat": lat,
+        "lon": lon,
+        "point": _geo_point(lat, lon) if lat is not None and lon is not None else None,
+        "city": (city or "").lower(),
+        "state": (state or "").lower(),
+        "country": (country or "").lower(),
+        "city_label": city,
+        "state_label": state,
+        "country_label": country,
+    }
+
+
+def _prepare_match_profile(
+    doc: Optional[Dict[str, Any]],
+    location: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Flatten ``doc`` into the fields the scorers read.
+
+    ``location`` may be passed when the caller already ran ``_match_location``
+    on the same document.
+    """
+    if not doc or not isinstance(doc, dict):
+        return None
+    if not _has_visible_dating_profile(doc):
+        return None
+
     relationships_lower, relationships_all = _collect_relationships(doc)
 
     preferences_age: Optional[Dict[str, int]] = None
@@ -991,16 +1057,7 @@ def _prepare_match_profile(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str,
         "relationships_lower": relationships_lower,
         "relationships_all": relationships_all,
         "preferences": {"age": preferences_age} if preferences_age else {},
-        "location": {
-            "lat": lat,
-            "lon": lon,
-            "city": (city or "").lower(),
-            "state": (state or "").lower(),
-            "country": (country or "").lower(),
-            "city_label": city,
-            "state_label": state,
-            "country_label": country,
-        },
+        "location": location if location is not None else _match_location(doc),
         "lifestyle": lifestyle,
         "keywords": keywords,
     }
@@ -1010,41 +1067,19 @@ def _score_location(viewer: Dict[str, Any], other: Dict[str, Any]) -> Tuple[floa
     weight = 30.0
     viewer_loc = viewer.get("location") or {}
     other_loc = other.get("location") or {}
-    lat_v = viewer_loc.get("lat")
-    lon_v = viewer_loc.get("lon")
-    lat_o = other_loc.get("lat")
-    lon_o = other_loc.get("lon")
+    point_v = viewer_loc.get("point")
+    point_o = other_loc.get("point")
     distance_km: Optional[float] = None
     level: Optional[str] = None
     score = 0.0
 
-    if (
-        isinstance(lat_v, (int, float))
-        and isinstance(lon_v, (int, float))
-        and isinstance(lat_o, (int, float))
-        and isinstance(lon_o, (int, float))
-    ):
-        distance_m = _haversine_distance_m(lat_v, lon_v, lat_o, lon_o)
-        if distance_m is not None and math.isfinite(distance_m):
+    if point_v is not None and point_o is not None:
+        distance_m = _geo_distance_m(point_v, point_o)
+        if math.isfinite(distance_m):
             distance_km = distance_m / 1000.0
-            if distance_km <= 25.0:
-                score = weight
-                level = "same-area"
-            elif distance_km <= 100.0:
-                score = 26.0
-                level = "nearby"
-            elif distance_km <= 250.0:
-                score = 22.0
-                level = "regional"
-            elif distance_km <= 500.0:
-                score = 18.0
-                level = "same-state"
-            elif distance_km <= 1500.0:
-                score = 12.0
-                level = "same-country"
-            else:
-                score = 6.0
-                level = "distant"
+            bucket = bisect_left(_LOCATION_BUCKET_LIMITS_KM, distance_km)
+            score = _LOCATION_BUCKET_SCORES[bucket]
+            level = _LOCATION_BUCKET_LEVELS[bucket]
 
     if score == 0.0:
         city_v = viewer_loc.get("city")
@@ -1239,12 +1274,9 @@ def _format_component(score: float, weight: int, meta: Dict[str, Any]) -> Dict[s
 
 
 def _compute_match_breakdown(
-    viewer_profile: Dict[str, Any], other_doc: Dict[str, Any]
-) -> Optional[Dict[str, Any]]:
-    other_profile = _prepare_match_profile(other_doc)
-    if not other_profile:
-        return None
-
+    viewer_profile: Dict[str, Any], other_profile: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Score two profiles already prepared by ``_prepare_match_profile``."""
     location_score, location_meta = _score_location(viewer_profile, other_profile)
     relationship_score, relationship_meta = _score_relationships(viewer_profile, other_profile)
     interest_score, interest_meta = _score_interest(viewer_profile, other_profile)
@@ -1334,6 +1366,7 @@ async def list_profiles(
     base_viewer_lon = viewer_lon if viewer_lon is not None else derived_lon
 
     has_viewer_coords = isinstance(base_viewer_lat, (int, float)) and isinstance(base_viewer_lon, (int, float))
+    viewer_point = _geo_point(base_viewer_lat, base_viewer_lon) if has_viewer_coords else None
     max_distance_m: Optional[float] = None
     if has_viewer_coords and max_distance_km is not None:
         try:
@@ -1341,6 +1374,8 @@ async def list_profiles(
         except (TypeError, ValueError):
             max_distance_m = None
 
+    viewer_user_id = (viewer_match_profile.get("userId") or "").strip() if viewer_match_profile else ""
+
     filtered: List[Dict] = []
 
     for raw_doc in docs:
@@ -1352,26 +1387,14 @@ async def list_profiles(
         if not _has_visible_dating_profile(doc):
             continue
 
+        # Parsed once per candidate: the distance filter and the match breakdown share it
+        location = _match_location(doc) if has_viewer_coords or viewer_match_profile else None
+
         if has_viewer_coords:
             distance_m: Optional[float] = None
-            loc = doc.get("location")
-            lat_val = None
-            lon_val = None
-            if isinstance(loc, dict):
-                lat_val = loc.get("lat")
-                lon_val = loc.get("lon")
-                if not isinstance(lat_val, (int, float)):
-                    lat_val = _coerce_float(lat_val, min_val=-90.0, max_val=90.0)
-                if not isinstance(lon_val, (int, float)):
-                    lon_val = _coerce_float(lon_val, min_val=-180.0, max_val=180.0)
-                if (lat_val is None or lon_val is None) and isinstance(loc.get("coordinates"), dict):
-                    parsed = _parse_geojson_point(loc.get("coordinates"))
-                    if parsed:
-                        if lat_val is None:
-                            lat_val = parsed.get("lat")
-                        if lon_val is None:
-                            lon_val = parsed.get("lon")
-            distance_m = _haversine_distance_m(base_viewer_lat, base_viewer_lon, lat_val, lon_val)
+            candidate_point = location["point"]
+            if viewer_point is not None and candidate_point is not None:
+                distance_m = _geo_distance_m(viewer_point, candidate_point)
             if max_distance_m is not None:
                 if distance_m is None or not math.isfinite(distance_m) or distance_m > max_distance_m:
                     continue
@@ -1379,13 +1402,12 @@ async def list_profiles(
                 doc["distanceMeters"] = float(distance_m)
 
         if viewer_match_profile:
-            viewer_user_id = (viewer_match_profile.get("userId") or "").strip()
-            candidate_user_id = str(doc.get("userId") or "").strip()
-            if not viewer_user_id or viewer_user_id != candidate_user_id:
-                breakdown = _compute_match_breakdown(viewer_match_profile, doc)
-                if breakdown:
-                    doc["matchBreakdown"] = breakdown
-                    doc["matchPercentage"] = breakdown.get("total")
+            # Only candidates that survived the distance filter are prepared for scoring
+            match_profile = _prepare_match_profile(doc, location)
+            if match_profile and (not viewer_user_id or viewer_user_id != match_profile["userId"]):
+                breakdown = _compute_match_breakdown(viewer_match_profile, match_profile)
+                doc["matchBreakdown"] = breakdown
+                doc["matchPercentage"] = breakdown.get("total")
 
         _apply_primary_photo_metadata(doc)
         doc.pop("hasDatingProfile", None)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
 from ..db import get_dating_db, get_db
 from ..db.collections import DATING_PROFILES_COLLECTION
@@ -109,7 +110,8 @@ async def list_likes_received(
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="profile missing userId")
     liked_me = await get_likes_received(db, user_id)
-    return LikesReceivedResponse(liked_me=liked_me)
+    # Rows are normalised by the service; returning a Response skips response_model re-validation
+    return ORJSONResponse({"liked_me": [user.model_dump() for user in liked_me]})
 
 
 @router.get("/matches", response_model=MatchesResponse)
@@ -121,7 +123,7 @@ async def list_matches(
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="profile missing userId")
     matches = await get_matches(db, user_id)
-    return MatchesResponse(matches=matches)
+    return ORJSONResponse({"matches": [user.model_dump() for user in matches]})
 
 
 __all__ = ["router"]
@@ -5,8 +5,9 @@ import uuid
 import time
 import os
 import json
-from ..cache import cache as local_cache
+from ..cache import cache as local_cache, jittered_ttl, single_flight
 from ..cache_bus import publish_invalidate
+from ..readmodels import latest_ttl_for, message_created_event
 from ..redis_bus import publish as redis_publish
 from ..redis_cache import (
     delete_prefix as redis_cache_delete_prefix,
@@ -210,45 +211,7 @@ def _parse_timestamp_to_ms(value) -> Optional[int]:
     return None
 
 
-@router.get("/messages/{group_id}/latest")
-async def get_latest_messages(
-    group_id: str,
-    request: Request,
-    response: Response,
-    count: Optional[int] = 100,
-) -> List[Dict[str, Any]]:
-    """Return the most recent messages for a group ordered oldest -> newest."""
-    db = get_db()
-    n = max(1, min(int(count or 100), 500))
-    cache_key = f"messages:latest:{group_id}:{n}"
-    inm = None
-    try:
-        inm = request.headers.get("if-none-match")
-    except Exception:
-        inm = None
-
-    cached = await local_cache.get(cache_key)
-    if cached is None:
-        redis_snapshot = await redis_cache_get(cache_key)
-        if redis_snapshot is not None:
-            cached = redis_snapshot
-            try:
-                await local_cache.set(cache_key, cached, ttl_seconds=LATEST_CACHE_TTL)
-            except Exception:
-                pass
-    if cached is not None:
-        try:
-            raw = json.dumps(cached, separators=(",", ":"), sort_keys=True)
-            response.headers["Cache-Control"] = "public, max-age=10, stale-while-revalidate=30"
-            tag = _etag_for(raw)
-            response.headers["ETag"] = tag
-            if inm and inm == tag:
-                response.status_code = 304
-                return []
-        except Exception:
-            pass
-        return cached
-
+async def _load_latest_messages(db, group_id: str, n: int, cache_key: str) -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
 
     # Prefer the read model cache if populated (already ordered oldest -> newest)
@@ -303,8 +266,53 @@ async def get_latest_messages(
                 pass
         enriched.append(message)
 
-    await local_cache.set(cache_key, enriched, ttl_seconds=LATEST_CACHE_TTL)
-    await redis_cache_set(cache_key, enriched, ttl_seconds=LATEST_CACHE_TTL)
+    ttl = jittered_ttl(latest_ttl_for(group_id, LATEST_CACHE_TTL))
+    await local_cache.set(cache_key, enriched, ttl_seconds=ttl)
+    await redis_cache_set(cache_key, enriched, ttl_seconds=ttl)
+    return enriched
+
+
+@router.get("/messages/{group_id}/latest")
+async def get_latest_messages(
+    group_id: str,
+    request: Request,
+    response: Response,
+    count: Optional[int] = 100,
+) -> List[Dict[str, Any]]:
+    """Return the most recent messages for a group ordered oldest -> newest."""
+    db = get_db()
+    n = max(1, min(int(count or 100), 500))
+    cache_key = f"messages:latest:{group_id}:{n}"
+    inm = None
+    try:
+        inm = request.headers.get("if-none-match")
+    except Exception:
+        inm = None
+
+    cached = await local_cache.get(cache_key)
+    if cached is None:
+        redis_snapshot = await redis_cache_get(cache_key)
+        if redis_snapshot is not None:
+            cached = redis_snapshot
+            try:
+                await local_cache.set(cache_key, cached, ttl_seconds=latest_ttl_for(group_id, LATEST_CACHE_TTL))
+            except Exception:
+                pass
+    if cached is not None:
+        try:
+            raw = json.dumps(cached, separators=(",", ":"), sort_keys=True)
+            response.headers["Cache-Control"] = "public, max-age=10, stale-while-revalidate=30"
+            tag = _etag_for(raw)
+            response.headers["ETag"] = tag
+            if inm and inm == tag:
+                response.status_code = 304
+                return []
+        except Exception:
+            pass
+        return cached
+
+    # Concurrent misses for the same window share one load (stampede protection)
+    enriched = await single_flight(cache_key, lambda: _load_latest_messages(db, group_id, n, cache_key))
 
     try:
         raw = json.dumps(enriched, separators=(",", ":"), sort_keys=True)
@@ -445,15 +453,7 @@ async def create_message(group_id: str, payload: Dict) -> Dict:
     await db[GROUP_MESSAGES_COLLECTION].insert_one(doc)
     # Publish domain event (best-effort, non-blocking)
     try:
-        await redis_publish("messages", {
-            "type": "message_created",
-            "groupId": group_id,
-            "messageId": mid,
-            "createdAt": doc["createdAt"],
-            "username": doc.get("username"),
-            "userId": doc.get("userId"),
-            "text": doc.get("text"),
-        })
+        await redis_publish("messages", message_created_event(group_id, mid, doc))
     except Exception:
         pass
     try:
@@ -4,6 +4,8 @@ import base64
 import os
 
 from ..integrations.cloudinary import (
+    AVATAR_EAGER,
+    AVATAR_FOLDER,
     is_enabled as cloud_enabled,
     ensure_configured,
     upload_data_url,
@@ -78,9 +80,9 @@ async def upload_avatar(avatar: UploadFile = File(...)) -> Dict:
     data_url = f"data:{mime};base64,{b64}"
     url = upload_data_url(
         data_url,
-        folder=os.getenv("CLOUDINARY_AVATAR_FOLDER", "funly/avatars"),
+        folder=AVATAR_FOLDER,
         resource_type="image",
-        eager=[{"width": 256, "height": 256, "crop": "fill", "gravity": "auto", "format": "webp", "quality": "auto"}],
+        eager=AVATAR_EAGER,
         eager_async=False,
     )
     return {"url": url, "type": mime}
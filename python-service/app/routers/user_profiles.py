@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import ORJSONResponse
 
 from ..models.user_profile import UserProfile, UserProfilePatch
 from ..repositories.exceptions import DuplicateKeyRepositoryError, NotFoundRepositoryError
@@ -9,22 +10,29 @@ from ..services.user_profile_service import (
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
 
+# Handlers return ORJSONResponse so FastAPI does not re-validate the trusted
+# profile against response_model; the models still document the responses.
+
+
+def _bearer_token(authorization: str) -> str:
+    rest = authorization.removeprefix("Bearer ")
+    # removeprefix leaves the header untouched when the scheme is missing
+    if len(rest) == len(authorization):
+        raise HTTPException(status_code=401, detail="missing bearer token")
+    return rest.strip()
+
 
 @router.get("/me", response_model=UserProfile)
 async def me(
     authorization: str = Header(default=""),
     service: UserProfileService = Depends(get_user_profile_service),
 ):
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="missing bearer token")
-
-    token = authorization[len("Bearer ") :].strip()
+    token = _bearer_token(authorization)
     profile_doc = await service.get_profile_from_token(token)
     if not profile_doc:
         raise HTTPException(status_code=401, detail="invalid token")
 
-    payload = service.redact_profile_document(profile_doc)
-    return UserProfile(**payload)
+    return ORJSONResponse(service.to_public_payload(profile_doc))
 
 
 @router.get("/id/{user_id}", response_model=UserProfile)
@@ -36,8 +44,7 @@ async def profile_by_id(
     if not profile_doc:
         raise HTTPException(status_code=404, detail="not found")
 
-    payload = service.redact_profile_document(profile_doc)
-    return UserProfile(**payload)
+    return ORJSONResponse(service.to_public_payload(profile_doc))
 
 
 @router.get("/{username}", response_model=UserProfile)
@@ -49,8 +56,7 @@ async def profile(
     if not profile_doc:
         raise HTTPException(status_code=404, detail="not found")
 
-    payload = service.redact_profile_document(profile_doc)
-    return UserProfile(**payload)
+    return ORJSONResponse(service.to_public_payload(profile_doc))
 
 
 @router.patch("/me", response_model=UserProfile)
@@ -59,10 +65,7 @@ async def update_me(
     authorization: str = Header(default=""),
     service: UserProfileService = Depends(get_user_profile_service),
 ):
-    if not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="missing bearer token")
-
-    token = authorization[len("Bearer ") :].strip()
+    token = _bearer_token(authorization)
     profile_doc = await service.get_profile_from_token(token)
     if not profile_doc:
         raise HTTPException(status_code=401, detail="invalid token")
@@ -76,8 +79,7 @@ async def update_me(
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    payload = service.redact_profile_document(updated_profile)
-    return UserProfile(**payload)
+    return ORJSONResponse(service.to_public_payload(updated_profile))
 
 
 __all__ = ["router"]
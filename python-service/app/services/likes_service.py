@@ -50,6 +50,61 @@ def _clean_photo_list(value: Any, limit: int = 12) -> List[str]:
     return photos
 
 
+def _optional_str(value: Any) -> Optional[str]:
+    cleaned = _clean_str(value)
+    if cleaned:
+        return cleaned
+    return value if isinstance(value, str) else None
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return None
+
+
+def _liked_user_from_row(row: dict) -> Optional[LikedUser]:
+    """Build a LikedUser from an aggregation row without re-running validation.
+
+    Every field is normalised here, so ``model_construct`` is safe and skips the
+    per-field pydantic validation that dominated large likes/matches listings.
+    Rows without a usable ``user_id`` are dropped.
+    """
+    user_id = _clean_str(row.get("user_id"))
+    if not user_id:
+        return None
+
+    profile_avatar = _clean_str(row.get("profile_avatar") or row.get("avatar"))
+    dating_photos = _clean_photo_list(row.get("dating_photos"))
+    dating_photo = _clean_str(row.get("dating_photo"))
+    if not dating_photo:
+        dating_photo = resolve_primary_photo(
+            {
+                "primaryPhotoUrl": row.get("dating_photo"),
+                "photos": dating_photos,
+            }
+        )
+    if not dating_photo and dating_photos:
+        dating_photo = dating_photos[0]
+
+    return LikedUser.model_construct(
+        user_id=user_id,
+        username=_optional_str(row.get("username")),
+        name=_optional_str(row.get("name")),
+        avatar=profile_avatar,
+        profile_avatar=profile_avatar,
+        dating_photo=dating_photo,
+        dating_photos=dating_photos or None,
+        has_dating_profile=bool(row.get("has_dating_profile")),
+        liked_at=_optional_int(row.get("liked_at")),
+        matched_at=_optional_int(row.get("matched_at")),
+    )
+
+
 async def is_reverse_like_exists(
     db: AsyncIOMotorDatabase, liker_id: str, liked_id: str
 ) -> bool:
@@ -245,42 +300,7 @@ async def get_likes_received(
     ]
     rows = await collection.aggregate(pipeline).to_list(length=None)
 
-    results: List[LikedUser] = []
-    for row in rows:
-        user_id = row.get("user_id")
-        if isinstance(user_id, str):
-            user_id = user_id.strip()
-
-        username = _clean_str(row.get("username")) or row.get("username")
-        name = _clean_str(row.get("name")) or row.get("name")
-
-        profile_avatar = _clean_str(row.get("profile_avatar") or row.get("avatar"))
-        dating_photos = _clean_photo_list(row.get("dating_photos"))
-        dating_photo = _clean_str(row.get("dating_photo"))
-        if not dating_photo:
-            dating_photo = resolve_primary_photo(
-                {
-                    "primaryPhotoUrl": row.get("dating_photo"),
-                    "photos": dating_photos,
-                }
-            )
-        if not dating_photo and dating_photos:
-            dating_photo = dating_photos[0]
-
-        liked_user = LikedUser(
-            user_id=user_id,
-            username=username,
-            name=name,
-            avatar=profile_avatar,
-            profile_avatar=profile_avatar,
-            dating_photo=dating_photo,
-            dating_photos=dating_photos or None,
-            has_dating_profile=bool(row.get("has_dating_profile")),
-            liked_at=row.get("liked_at"),
-        )
-        results.append(liked_user)
-
-    return results
+    return [user for user in map(_liked_user_from_row, rows) if user is not None]
 
 
 async def get_matches(
@@ -437,43 +457,7 @@ async def get_matches(
     ]
     rows = await collection.aggregate(pipeline).to_list(length=None)
 
-    results: List[LikedUser] = []
-    for row in rows:
-        user_id = row.get("user_id")
-        if isinstance(user_id, str):
-            user_id = user_id.strip()
-
-        username = _clean_str(row.get("username")) or row.get("username")
-        name = _clean_str(row.get("name")) or row.get("name")
-
-        profile_avatar = _clean_str(row.get("profile_avatar") or row.get("avatar"))
-        dating_photos = _clean_photo_list(row.get("dating_photos"))
-        dating_photo = _clean_str(row.get("dating_photo"))
-        if not dating_photo:
-            dating_photo = resolve_primary_photo(
-                {
-                    "primaryPhotoUrl": row.get("dating_photo"),
-                    "photos": dating_photos,
-                }
-            )
-        if not dating_photo and dating_photos:
-            dating_photo = dating_photos[0]
-
-        liked_user = LikedUser(
-            user_id=user_id,
-            username=username,
-            name=name,
-            avatar=profile_avatar,
-            profile_avatar=profile_avatar,
-            dating_photo=dating_photo,
-            dating_photos=dating_photos or None,
-            has_dating_profile=bool(row.get("has_dating_profile")),
-            liked_at=row.get("liked_at"),
-            matched_at=row.get("matched_at"),
-        )
-        results.append(liked_user)
-
-    return results 
+    return [user for user in map(_liked_user_from_row, rows) if user is not None]
 
 
 __all__ = [
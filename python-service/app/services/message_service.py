@@ -18,6 +18,7 @@ from ..models.message import (
     MessageBase,
     ReactionSummary,
 )
+from ..readmodels import message_created_event
 from ..redis_bus import publish as redis_publish
 from ..redis_cache import (
     delete_prefix as redis_cache_delete_prefix,
@@ -351,18 +352,7 @@ async def create_group_message(
     await db[GROUP_MESSAGES_COLLECTION].insert_one(doc)
 
     try:
-        await redis_publish(
-            "messages",
-            {
-                "type": "message_created",
-                "groupId": group_id,
-                "messageId": mid,
-                "createdAt": doc["createdAt"],
-                "username": doc.get("username"),
-                "userId": doc.get("userId"),
-                "text": doc.get("text"),
-            },
-        )
+        await redis_publish("messages", message_created_event(group_id, mid, doc))
     except Exception:
         pass
 
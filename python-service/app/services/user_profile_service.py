@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
+import secrets
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from typing import Any, Dict, Optional
 from urllib.parse import quote as url_quote
 
 import bcrypt
 import jwt
 
+from ..cache import TTLCache
 from ..config import get_settings
+from ..redis_bus import get_client as get_redis_client
+from ..utils.safe import EXPECTED_ERRORS
 from ..db import get_user_db
 from ..models.user_profile import (
     UserLoginRequest,
+    UserProfile,
     UserProfileDocument,
     UserProfilePatch,
     UserSignupRequest,
@@ -20,22 +30,81 @@ from ..repositories.exceptions import DuplicateKeyRepositoryError, NotFoundRepos
 from ..repositories.user_profile import UserProfileRepository
 
 
+# bcrypt work factor for new hashes; existing hashes keep the cost they were created with
+_BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+# bcrypt releases the GIL, so hashing in threads runs in parallel and keeps the loop free.
+# A dedicated pool keeps login bursts from starving the default executor.
+_password_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2))),
+    thread_name_prefix="bcrypt",
+)
+
+_PASSWORD_SYMBOLS = frozenset("!@#$%^&*()-_=+[]{};:,<.>/?")
+# Number of character classes present for each 4-bit class mask
+_CLASS_COUNTS = tuple(bin(mask).count("1") for mask in range(16))
+
+# Verified JWT payloads keyed by a keyed digest of the token (raw tokens are never stored)
+_DECODED_TOKEN_TTL_SECONDS = 30
+_decoded_tokens = TTLCache()
+
+# Tokens issued in the same 15s bucket are reused for repeat signup/login bursts
+_ISSUED_TOKEN_BUCKET_SECONDS = 15
+_ISSUED_TOKEN_CACHE_MAX = 1024
+_issued_tokens: Dict[tuple[str, str, str, int], tuple[str, int]] = {}
+
+# UserProfile is UserProfileDocument minus the private fields; both use the same
+# attribute names, so the public view is copied attribute-by-attribute as
+# (attribute, JSON key) pairs for building the response body straight from a document
+_PUBLIC_PROFILE_KEYS = tuple(
+    (name, field.alias or name) for name, field in UserProfile.model_fields.items()
+)
+
+
 class RateLimiter:
-    """Very small in-memory rate limiter for authentication flows."""
+    """Very small in-memory rate limiter for authentication flows.
 
-    def __init__(self, window_seconds: int, max_attempts: int) -> None:
+    Fixed windows are keyed by caller. Every window lasts the same time and is
+    created at "now", so insertion order is expiry order: expired windows are
+    dropped from the front on each call, and at most ``max_keys`` windows are
+    kept, so memory stays bounded under scans.
+    """
+
+    def __init__(self, window_seconds: int, max_attempts: int, max_keys: int = 100_000) -> None:
         self._window = float(window_seconds)
         self._max_attempts = max_attempts
-        self._state: Dict[str, Dict[str, float]] = {}
+        self._max_keys = max(1, max_keys)
+        # key -> [count, expires_at (monotonic)]
+        self._state: OrderedDict[str, list] = OrderedDict()
 
     def increment(self, key: str) -> bool:
-        now = time.time()
-        record = self._state.get(key)
-        if not record or record.get("expires", 0) < now:
-            record = {"count": 0.0, "expires": now + self._window}
-        record["count"] = record.get("count", 0.0) + 1.0
-        self._state[key] = record
-        return record["count"] <= self._max_attempts
+        now = time.monotonic()
+        state = self._state
+        while state:
+            oldest = next(iter(state.values()))
+            if oldest[1] > now:
+                break
+            state.popitem(last=False)
+        record = state.get(key)
+        if record is None:
+            if len(state) >= self._max_keys:
+                state.popitem(last=False)
+            record = state[key] = [0, now + self._window]
+        record[0] += 1
+        return record[0] <= self._max_attempts
+
+
+@cache
+def _dummy_password_hash() -> str:
+    # Built on first use rather than at import: a cost-12 hash takes a noticeable fraction of a second
+    return bcrypt.hashpw(os.urandom(16), bcrypt.gensalt(rounds=_BCRYPT_COST)).decode("utf-8")
+
+
+@cache
+def _shared_rate_limiter(window_seconds: int, max_attempts: int) -> RateLimiter:
+    # Services are built per request; the limiter state has to outlive them
+    return RateLimiter(window_seconds, max_attempts)
 
 
 class UserProfileService:
@@ -53,59 +122,138 @@ class UserProfileService:
         self._repository = repository
         self._jwt_secret = jwt_secret
         self._token_ttl = token_ttl_seconds
-        self._rate_limiter = RateLimiter(rate_limit_window, rate_limit_max)
+        self._rate_limit_window = rate_limit_window
+        self._rate_limit_max = rate_limit_max
+        self._rate_limiter = _shared_rate_limiter(rate_limit_window, rate_limit_max)
 
     @staticmethod
     def _now_ms() -> int:
-        return int(time.time() * 1000)
+        return time.time_ns() // 1_000_000
 
-    @staticmethod
-    def _generate_user_id() -> str:
-        return f"u_{int(time.time()*1000)}_{os.urandom(4).hex()}"
+    @classmethod
+    def _generate_user_id(cls) -> str:
+        return f"u_{cls._now_ms()}_{secrets.token_hex(4)}"
 
     @staticmethod
     def hash_password(raw: str) -> str:
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=_BCRYPT_COST)
         return bcrypt.hashpw(raw.encode("utf-8"), salt).decode("utf-8")
 
     @staticmethod
     def verify_password(raw: str, hashed: str) -> bool:
+        # Anything that is not a bcrypt hash can never match; skip the C call for it
+        if not isinstance(hashed, str) or not hashed.startswith(_BCRYPT_PREFIXES):
+            return False
         try:
             return bcrypt.checkpw(raw.encode("utf-8"), hashed.encode("utf-8"))
-        except Exception:
+        except (ValueError, TypeError):
+            # Malformed hash/salt, or a password that cannot be encoded
             return False
 
+    @classmethod
+    def _verify_dummy_password(cls, raw: str) -> bool:
+        # Runs in the password pool, which also absorbs building the dummy hash once
+        return cls.verify_password(raw, _dummy_password_hash())
+
+    @classmethod
+    async def hash_password_async(cls, raw: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(_password_pool, cls.hash_password, raw)
+
+    @classmethod
+    async def verify_password_async(cls, raw: str, hashed: str) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(
+            _password_pool, cls.verify_password, raw, hashed
+        )
+
     @staticmethod
     def password_strength(password: str) -> bool:
-        score = 0
-        if any(c.islower() for c in password):
-            score += 1
-        if any(c.isupper() for c in password):
-            score += 1
-        if any(c.isdigit() for c in password):
-            score += 1
-        if any(c in "!@#$%^&*()-_=+[]{};:,<.>/?" for c in password):
-            score += 1
-        return score >= 3 and len(password) >= 8
-
-    def allow_rate(self, key: str) -> bool:
-        return self._rate_limiter.increment(key)
+        if len(password) < 8:
+            return False
+        # One pass: bit per character class (lower, upper, digit, symbol)
+        mask = 0
+        for c in password:
+            if c.islower():
+                mask |= 1
+            elif c.isupper():
+                mask |= 2
+            elif c.isdigit():
+                mask |= 4
+            elif c in _PASSWORD_SYMBOLS:
+                mask |= 8
+            else:
+                continue
+            if mask == 15:
+                break
+        return _CLASS_COUNTS[mask] >= 3
+
+    async def allow_rate(self, key: str) -> bool:
+        """Count an attempt for ``key``; False once the window's budget is spent.
+
+        Uses a Redis counter shared by every worker when Redis is configured,
+        and falls back to the in-process limiter otherwise.
+        """
+        client = await get_redis_client()
+        if client is None:
+            return self._rate_limiter.increment(key)
+        redis_key = f"rl:{key}"
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.incr(redis_key)
+                pipe.ttl(redis_key)
+                count, ttl = await pipe.execute()
+            if ttl < 0:
+                # First hit of the window (or a counter left without expiry): start the window
+                await client.expire(redis_key, self._rate_limit_window)
+        except EXPECTED_ERRORS:
+            return self._rate_limiter.increment(key)
+        return int(count) <= self._rate_limit_max
 
     def issue_token(self, user_id: str, username: str) -> str:
-        now = int(time.time())
+        now = time.time_ns() // 1_000_000_000
+        cache_key = (self._jwt_secret, user_id, username, now // _ISSUED_TOKEN_BUCKET_SECONDS)
+        cached = _issued_tokens.get(cache_key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
         payload = {
             "sub": user_id,
             "username": username,
             "iat": now,
             "exp": now + self._token_ttl,
         }
-        return jwt.encode(payload, self._jwt_secret, algorithm="HS256")
+        token = jwt.encode(payload, self._jwt_secret, algorithm="HS256")
+        if len(_issued_tokens) >= _ISSUED_TOKEN_CACHE_MAX:
+            # Buckets are short-lived; dropping everything stale is enough to stay bounded
+            bucket = now // _ISSUED_TOKEN_BUCKET_SECONDS
+            for key in [k for k in _issued_tokens if k[3] != bucket]:
+                del _issued_tokens[key]
+            if len(_issued_tokens) >= _ISSUED_TOKEN_CACHE_MAX:
+                _issued_tokens.clear()
+        _issued_tokens[cache_key] = (token, payload["exp"])
+        return token
 
     def decode_token(self, token: str) -> Optional[Dict[str, Any]]:
+        digest = hashlib.blake2b(
+            token.encode("utf-8"),
+            digest_size=16,
+            key=self._jwt_secret.encode("utf-8")[:64],
+        ).hexdigest()
+        cache_key = f"jwt:{digest}"
+        cached = _decoded_tokens.get_sync(cache_key)
+        if cached is not None:
+            return dict(cached)
         try:
-            return jwt.decode(token, self._jwt_secret, algorithms=["HS256"])
+            payload = jwt.decode(token, self._jwt_secret, algorithms=["HS256"])
         except Exception:
+            # Failures are never cached
             return None
+        # Keep the entry no longer than the token itself stays valid
+        exp = payload.get("exp")
+        ttl = _DECODED_TOKEN_TTL_SECONDS
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, int(exp - time.time()))
+        if ttl > 0:
+            _decoded_tokens.set_sync(cache_key, payload, ttl)
+        return dict(payload)
 
     async def get_profile_from_token(self, token: str) -> Optional[UserProfileDocument]:
         if not token:
@@ -140,6 +288,8 @@ class UserProfileService:
             return None
 
         from ..integrations.cloudinary import (
+            AVATAR_EAGER,
+            AVATAR_FOLDER,
             ensure_configured as cloud_ensure,
             is_enabled as cloud_enabled,
             upload_data_url as cloud_upload_data_url,
@@ -147,30 +297,24 @@ class UserProfileService:
 
         try:
             data_to_upload: Optional[str] = None
-            lowered = candidate.lower()
-            if lowered.startswith("data:image/"):
+            # Only the scheme is compared: lowering a whole data URL copies hundreds of KB
+            head = candidate[:16].lower()
+            if head.startswith("data:image/"):
                 data_to_upload = candidate
             elif candidate.startswith("<svg"):
                 data_to_upload = f"data:image/svg+xml;utf8,{url_quote(candidate)}"
-            elif lowered.startswith("http://") or lowered.startswith("https://"):
+            elif head.startswith(("http://", "https://")):
                 data_to_upload = candidate
 
             if data_to_upload and cloud_enabled():
                 cloud_ensure()
-                uploaded = cloud_upload_data_url(
+                # The SDK upload is a blocking HTTP call; keep it off the event loop
+                uploaded = await asyncio.to_thread(
+                    cloud_upload_data_url,
                     data_to_upload,
-                    folder=os.getenv("CLOUDINARY_AVATAR_FOLDER", "funly/avatars"),
+                    folder=AVATAR_FOLDER,
                     resource_type="image",
-                    eager=[
-                        {
-                            "width": 256,
-                            "height": 256,
-                            "crop": "fill",
-                            "gravity": "auto",
-                            "format": "webp",
-                            "quality": "auto",
-                        }
-                    ],
+                    eager=AVATAR_EAGER,
                     eager_async=False,
                 )
                 if uploaded:
@@ -184,7 +328,9 @@ class UserProfileService:
         username = payload.username.strip()
         if not username:
             raise ValueError("username required")
-        if await self._repository.username_exists(username):
+        # Cheap indexed check before the avatar upload and bcrypt hash, so a taken
+        # name costs neither; the unique index still catches concurrent signups
+        if not await self.ensure_username_available(username):
             raise DuplicateKeyRepositoryError("username already taken")
         if not self.password_strength(payload.password):
             raise ValueError("weak password")
@@ -192,7 +338,7 @@ class UserProfileService:
         user_id = self._generate_user_id()
         now_ms = self._now_ms()
         avatar_url = await self.normalize_avatar(payload.avatar_url)
-        hashed = self.hash_password(payload.password)
+        hashed = await self.hash_password_async(payload.password)
 
         return await self._repository.create_profile(
             user_id=user_id,
@@ -208,10 +354,20 @@ class UserProfileService:
         username = payload.username.strip()
         if not username:
             raise ValueError("username required")
-        profile = await self._repository.get_by_username(username)
+        # Check the password against a projected document; the full profile is only
+        # loaded (usually from the Redis cache) once the credentials are good
+        material = await self._repository.get_auth_material_by_username(username)
+        if not material:
+            # Spend the same bcrypt time as a wrong password so response timing
+            # does not reveal which usernames exist
+            await asyncio.get_running_loop().run_in_executor(
+                _password_pool, self._verify_dummy_password, payload.password
+            )
+            raise PermissionError("invalid credentials")
+        if not await self.verify_password_async(payload.password, material.password_hash):
+            raise PermissionError("invalid credentials")
+        profile = await self._repository.get_by_user_id(material.user_id)
         if not profile:
-            raise NotFoundRepositoryError("user not found")
-        if not self.verify_password(payload.password, profile.password_hash):
             raise PermissionError("invalid credentials")
         return profile
 
@@ -237,6 +393,7 @@ class UserProfileService:
             username = patch.username.strip()
             if not username:
                 raise ValueError("username required")
+            # Checked before any avatar upload; the unique index covers the race
             if not await self.ensure_username_available(username, exclude_user_id=user_id):
                 raise DuplicateKeyRepositoryError("username already taken")
             updates["username"] = username
@@ -246,19 +403,9 @@ class UserProfileService:
             updates["avatarUrl"] = await self.normalize_avatar(patch.avatar_url)
 
         if patch.friends is not None:
-            deduped: list[str] = []
-            seen = set()
-            for entry in patch.friends:
-                if not isinstance(entry, str):
-                    continue
-                cleaned = entry.strip()
-                if not cleaned or cleaned in seen:
-                    continue
-                deduped.append(cleaned)
-                seen.add(cleaned)
-                if len(deduped) >= 100:
-                    break
-            updates["friends"] = deduped
+            cleaned = (entry.strip() for entry in patch.friends if isinstance(entry, str))
+            # dict keeps first-seen order, so this is an ordered dedupe done in C
+            updates["friends"] = list(dict.fromkeys(entry for entry in cleaned if entry))[:100]
 
         if not updates:
             profile = await self._repository.get_by_user_id(user_id)
@@ -269,6 +416,18 @@ class UserProfileService:
         updates["updatedAt"] = self._now_ms()
         return await self._repository.update_profile(user_id=user_id, updates=updates)
 
+    @staticmethod
+    def to_public_payload(doc: UserProfileDocument) -> Dict[str, Any]:
+        """JSON-ready public profile, keyed by the same aliases as the response model.
+
+        Matches what the ``UserProfile`` response model would serialize for
+        ``doc``, without building and re-validating the model.
+        """
+        payload = {key: getattr(doc, name) for name, key in _PUBLIC_PROFILE_KEYS}
+        # The only non-JSON value; PyObjectId serializes as its hex string
+        payload["_id"] = str(payload["_id"])
+        return payload
+
     @staticmethod
     def redact_profile_document(doc: UserProfileDocument) -> Dict[str, Any]:
         data = doc.model_dump(by_alias=True)
@@ -0,0 +1,28 @@
+"""Helpers for best-effort side effects such as cache fills and invalidations."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Optional, TypeVar
+
+from redis.exceptions import RedisError
+
+__all__ = ["EXPECTED_ERRORS", "safe_await"]
+
+LOGGER = logging.getLogger("uvicorn.error")
+
+T = TypeVar("T")
+
+# Failures a best-effort Redis/cache call is allowed to swallow. Anything else
+# (TypeError, KeyError, ...) is a bug and should surface.
+EXPECTED_ERRORS = (RedisError, OSError, asyncio.TimeoutError, ValueError)
+
+
+async def safe_await(awaitable: Awaitable[T], default: Optional[T] = None) -> Optional[T]:
+    """Await ``awaitable`` and return ``default`` if it fails with an expected error."""
+    try:
+        return await awaitable
+    except EXPECTED_ERRORS as exc:
+        LOGGER.debug("Ignored best-effort failure: %r", exc)
+        return default
@@ -14,6 +14,7 @@ if str(SERVICE_ROOT) not in sys.path:
     sys.path.insert(0, str(SERVICE_ROOT))
 
 from app.main import app
+from app.cache import cache as local_cache
 from app.db import close_mongo_connection, connect_to_mongo
 from app.config import get_settings
 
@@ -24,6 +25,8 @@ def _env_overrides(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("MONGO_DB_NAME", "jesseiniya2023-test")
     monkeypatch.setenv("JWT_SECRET", "test-secret")
     get_settings.cache_clear()  # type: ignore[attr-defined]
+    # Process-local cache entries (e.g. profiles by userId) must not leak between tests
+    local_cache.clear()
 
 
 @pytest_asyncio.fixture
@@ -44,3 +47,5 @@ async def api_client(mongo_client: AsyncMongoMockClient) -> AsyncIterator[AsyncC
     async with AsyncClient(app=app, base_url="http://testserver") as client:
         yield client
     await close_mongo_connection()
+    # The cache's sweeper task is bound to this test's event loop
+    await local_cache.stop()
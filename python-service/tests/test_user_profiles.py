@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 
 from app.db import get_user_db
@@ -26,6 +28,7 @@ async def test_user_profile_repository_crud(api_client) -> None:
     fetched_by_id = await repo.get_by_user_id("user-1")
     assert fetched_by_id is not None
     assert fetched_by_id.username == "Alice"
+    assert fetched_by_id.password_hash is None
 
     fetched_by_username = await repo.get_by_username("alice")
     assert fetched_by_username is not None
@@ -41,3 +44,58 @@ async def test_user_profile_repository_crud(api_client) -> None:
 
     available = await repo.username_exists("Bob")
     assert available is False
+
+
+@pytest.mark.asyncio
+async def test_user_profile_repository_coalesces_concurrent_lookups(
+    api_client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo = UserProfileRepository(get_user_db())
+    for idx in range(3):
+        await repo.create_profile(
+            user_id=f"user-{idx}",
+            username=f"Member{idx}",
+            password_hash="hash",
+            created_at=1,
+            updated_at=1,
+        )
+
+    # Record every read the batch loaders issue against the profiles collection
+    queries: list[dict] = []
+    collection_type = type(repo.collection)
+    original_find = collection_type.find
+    original_find_one = collection_type.find_one
+
+    def spy_find(self, filter=None, *args, **kwargs):
+        queries.append(filter)
+        return original_find(self, filter, *args, **kwargs)
+
+    def spy_find_one(self, filter=None, *args, **kwargs):
+        queries.append(filter)
+        return original_find_one(self, filter, *args, **kwargs)
+
+    monkeypatch.setattr(collection_type, "find", spy_find)
+    monkeypatch.setattr(collection_type, "find_one", spy_find_one)
+
+    results = await asyncio.gather(
+        repo.get_by_user_id("user-0"),
+        UserProfileRepository(get_user_db()).get_by_user_id("user-2"),
+        repo.get_by_user_id("user-0"),
+        repo.get_by_user_id("missing"),
+        repo.get_by_username("MEMBER1"),
+    )
+
+    assert [doc.user_id if doc else None for doc in results] == [
+        "user-0",
+        "user-2",
+        "user-0",
+        None,
+        "user-1",
+    ]
+
+    by_user_id = [query for query in queries if "userId" in query]
+    # All by-id lookups, across repository instances, went out as one $in query,
+    # and the duplicate user-0 lookups shared a single slot in it
+    assert len(by_user_id) == 1
+    in_keys = by_user_id[0]["userId"]["$in"]
+    assert sorted(in_keys) == ["missing", "user-0", "user-2"]